@@ -5,11 +5,12 @@ Handles user registration, login, logout, and token management
 from datetime import timedelta
 from typing import Any, Dict
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request, Cookie, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.simple_auth_middleware import require_auth
+from app.core.simple_auth_middleware import get_full_user
 from app.services.auth.auth_service import auth_service
 from app.services.auth.oauth_service import oauth_service
 from app.models.entities.user import User
@@ -36,7 +37,8 @@ async def register(
     """Register a new user with email/password"""
     try:
         # Create user
-        user = auth_service.register_user(user_data, db)
+        # bcrypt hashing and the blocking DB calls run in a worker thread
+        user = await run_in_threadpool(auth_service.register_user, user_data, db)
         
         # Generate tokens
         tokens = auth_service.jwt_service.create_token_pair(user)
@@ -66,7 +68,8 @@ async def login(
     """Login with email/password"""
     try:
         # Authenticate user
-        user = auth_service.authenticate_user(credentials, db)
+        # bcrypt verification and the blocking DB calls run in a worker thread
+        user = await run_in_threadpool(auth_service.authenticate_user, credentials, db)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -143,7 +146,7 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(require_auth)
+    current_user: User = Depends(get_full_user)
 ):
     """Get current user information with automatic token refresh"""
     return UserResponse.from_orm(current_user)
@@ -175,7 +178,9 @@ async def reset_password(
 ):
     """Reset password with token"""
     try:
-        user = auth_service.reset_password(
+        # bcrypt hashing and the blocking DB calls run in a worker thread
+        user = await run_in_threadpool(
+            auth_service.reset_password,
             reset_data.token, 
             reset_data.new_password, 
             db
@@ -224,7 +229,7 @@ async def verify_email(
 
 @router.post("/resend-verification")
 async def resend_verification(
-    current_user: User = Depends(require_auth),
+    current_user: User = Depends(get_full_user),
     db: Session = Depends(get_db)
 ):
     """Resend email verification"""
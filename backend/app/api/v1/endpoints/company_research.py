@@ -2,17 +2,19 @@
 Company Research API Endpoints
 Provides endpoints for company research functionality
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
+from fastapi.responses import Response, StreamingResponse
 import logging
 import time
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from pydantic import BaseModel
 import json
 import hashlib
 
 from app.models.schemas.company_research import (
     CompanyResearchRequest, CompanyResearchResponse, ResearchProgress,
-    ResearchCostEstimate
+    ResearchCostEstimate, ResearchResultsPage
 )
 from app.services.company_research.company_research_orchestrator import CompanyResearchOrchestrator
 from app.config.settings import settings
@@ -24,8 +26,14 @@ router = APIRouter()
 # Initialize orchestrator
 research_orchestrator = CompanyResearchOrchestrator()
 
+# LRU of cache_key -> (expires_at, CompanyResearchResponse), checked before Redis
+_local_response_cache: "OrderedDict[str, Tuple[float, CompanyResearchResponse]]" = OrderedDict()
+
 @router.post("/research", response_model=CompanyResearchResponse)
-async def research_company(request: CompanyResearchRequest):
+async def research_company(
+    request: CompanyResearchRequest,
+    summary: bool = Query(False, description="Trim large result lists to the top results; fetch the rest via the paginated endpoints")
+):
     """
     Perform comprehensive company research
     
@@ -40,16 +48,7 @@ async def research_company(request: CompanyResearchRequest):
         logger.info(f"🚀 Starting company research for: {request.company_name or request.company_domain}")
 
         # Build cache keys - both complex hash-based and simple company name-based
-        try:
-            request_payload = request.dict()
-        except Exception:
-            # Fallback in case of different pydantic version
-            request_payload = json.loads(request.json())
-
-        # Complex cache key for exact request matching
-        normalized_payload = json.dumps(request_payload, sort_keys=True)
-        cache_key_hash = hashlib.sha256(normalized_payload.encode("utf-8")).hexdigest()
-        complex_cache_key = f"company_research:research:{cache_key_hash}"
+        complex_cache_key = f"company_research:research:{_request_digest(request)}"
         
         # Simple cache key based on company name/domain
         company_identifier = request.company_name or request.company_domain or "unknown"
@@ -58,33 +57,19 @@ async def research_company(request: CompanyResearchRequest):
         logger.info(f"Generated cache keys - Complex: {complex_cache_key}, Simple: {simple_cache_key}")
 
         # Try cache first (check both keys)
-        cached = None
+        cached_response = None
         cache_source = None
         
-        # First try complex cache key
-        cached = redis_cache.get(complex_cache_key)
-        if cached:
-            cache_source = "complex"
-            logger.info(f"✅ CACHE HIT: Found exact match in complex cache for key: {complex_cache_key}")
-        else:
-            # Try simple cache key
-            cached = redis_cache.get(simple_cache_key)
-            if cached:
-                cache_source = "simple"
-                logger.info(f"✅ CACHE HIT: Found match in simple cache for key: {simple_cache_key}")
+        for cache_source, cache_key in (("complex", complex_cache_key), ("simple", simple_cache_key)):
+            cached_response = _get_cached_response(cache_key)
+            if cached_response is not None:
+                logger.info(f"✅ CACHE HIT: Found match in {cache_source} cache for key: {cache_key}")
+                break
         
-        if cached:
-            cache_response_time = time.time() - request_start_time
-            logger.info(f"⚡ Returning company research from {cache_source} cache (took {cache_response_time:.2f}s)")
-            try:
-                # Parse the cached data back into the response model
-                response = CompanyResearchResponse.model_validate(cached)
-                total_request_time = time.time() - request_start_time
-                logger.info(f"✅ Successfully parsed cached response for: {response.company_name} - Total time: {total_request_time:.2f}s")
-                return response
-            except Exception as e:
-                # If structure changed, ignore cache and proceed
-                logger.warning(f"Cached company research payload could not be parsed; regenerating. Error: {str(e)}")
+        if cached_response is not None:
+            total_request_time = time.time() - request_start_time
+            logger.info(f"⚡ Returning company research from {cache_source} cache for: {cached_response.company_name} - Total time: {total_request_time:.2f}s")
+            return _model_response(_summarize_response(cached_response) if summary else cached_response)
 
         # Perform research
         logger.info("No cache hit found, performing fresh research...")
@@ -93,43 +78,178 @@ async def research_company(request: CompanyResearchRequest):
         research_time = time.time() - start_time
         logger.info(f"Research completed in {research_time:.2f} seconds for: {response.company_name}")
 
-        # Store in cache (serialize to dict for safe JSON storage)
-        try:
-            # Use mode='json' to ensure datetime objects are properly serialized
-            response_dict = response.model_dump(mode='json')
-        except Exception:
-            try:
-                # Fallback for older pydantic versions
-                response_dict = response.dict()
-            except Exception:
-                # Final fallback - serialize to JSON string then parse back
-                response_json = response.json()
-                response_dict = json.loads(response_json)
-        
         # Store in both cache keys
         cache_expire = 3600  # 1 hour
-        complex_set_success = redis_cache.set(complex_cache_key, response_dict, expire=cache_expire)
-        simple_set_success = redis_cache.set(simple_cache_key, response_dict, expire=cache_expire)
-        
-        if complex_set_success:
-            logger.info(f"✅ CACHE SET: Successfully stored in complex cache with key: {complex_cache_key} (expires in {cache_expire}s)")
-        else:
-            logger.warning(f"❌ CACHE SET FAILED: Failed to store in complex cache with key: {complex_cache_key}")
-            
-        if simple_set_success:
-            logger.info(f"✅ CACHE SET: Successfully stored in simple cache with key: {simple_cache_key} (expires in {cache_expire}s)")
-        else:
-            logger.warning(f"❌ CACHE SET FAILED: Failed to store in simple cache with key: {simple_cache_key}")
+        for cache_key in (complex_cache_key, simple_cache_key):
+            if _store_cached_response(cache_key, response, cache_expire):
+                logger.info(f"✅ CACHE SET: Successfully stored research with key: {cache_key} (expires in {cache_expire}s)")
+            else:
+                logger.warning(f"❌ CACHE SET FAILED: Failed to store research with key: {cache_key}")
+        _store_result_lists(response, cache_expire)
 
         total_request_time = time.time() - request_start_time
         logger.info(f"✅ Company research completed for: {response.company_name} - Total time: {total_request_time:.2f}s")
-        return response
+        return _model_response(_summarize_response(response) if summary else response)
 
     except Exception as e:
         total_request_time = time.time() - request_start_time
         logger.error(f"❌ Company research failed after {total_request_time:.2f}s: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Research failed: {str(e)}")
 
+def _model_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model straight to JSON bytes
+    
+    pydantic-core encodes datetimes, enums and nested models natively, so this
+    skips FastAPI's response_model re-validation and jsonable_encoder pass.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+def _request_digest(request: CompanyResearchRequest) -> str:
+    """Hash the request fields that determine the research result"""
+    key = (
+        request.company_name,
+        request.company_domain,
+        request.research_depth,
+        request.include_employee_reviews,
+        request.include_financial_data
+    )
+    return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=32).hexdigest()
+
+def _get_local_response(cache_key: str) -> Optional[CompanyResearchResponse]:
+    """Get a research response from the in-process cache"""
+    cached = _local_response_cache.get(cache_key)
+    if cached is None:
+        return None
+    
+    expires_at, response = cached
+    if time.monotonic() >= expires_at:
+        _local_response_cache.pop(cache_key, None)
+        return None
+    
+    _local_response_cache.move_to_end(cache_key)
+    return response
+
+def _set_local_response(cache_key: str, response: CompanyResearchResponse) -> None:
+    """Store a research response in the in-process cache"""
+    if settings.RESEARCH_LOCAL_CACHE_MAX_SIZE <= 0:
+        return
+    
+    _local_response_cache[cache_key] = (time.monotonic() + settings.RESEARCH_LOCAL_CACHE_TTL_SECONDS, response)
+    _local_response_cache.move_to_end(cache_key)
+    if len(_local_response_cache) > settings.RESEARCH_LOCAL_CACHE_MAX_SIZE:
+        _local_response_cache.popitem(last=False)
+
+def _get_cached_response(cache_key: str) -> Optional[CompanyResearchResponse]:
+    """
+    Load a cached research response
+    
+    The in-process cache is checked first. With REDIS_TRUSTED_PICKLE the response
+    object is unpickled directly, skipping JSON decoding and model validation;
+    otherwise the JSON payload is validated.
+    """
+    response = _get_local_response(cache_key)
+    if response is not None:
+        return response
+    
+    if settings.REDIS_TRUSTED_PICKLE:
+        cached = redis_cache.get_pickle(f"{cache_key}:pkl")
+        if isinstance(cached, CompanyResearchResponse):
+            _set_local_response(cache_key, cached)
+            return cached
+        return None
+    
+    cached = redis_cache.get(cache_key)
+    if not cached:
+        return None
+    try:
+        response = CompanyResearchResponse.model_validate(cached)
+    except Exception as e:
+        # If structure changed, ignore cache and proceed
+        logger.warning(f"Cached company research payload could not be parsed; regenerating. Error: {str(e)}")
+        return None
+    
+    _set_local_response(cache_key, response)
+    return response
+
+def _store_cached_response(cache_key: str, response: CompanyResearchResponse, expire: int) -> bool:
+    """Store a research response in the cache (pickle for trusted Redis, JSON otherwise)"""
+    _set_local_response(cache_key, response)
+    
+    if settings.REDIS_TRUSTED_PICKLE:
+        return redis_cache.set_pickle(f"{cache_key}:pkl", response, expire=expire)
+    
+    # Use mode='json' to ensure datetime objects are properly serialized
+    return redis_cache.set(cache_key, response.model_dump(mode='json'), expire=expire)
+
+def _result_list_key(request_id: str, list_name: str) -> str:
+    """Redis key for a stored research result list"""
+    return f"company_research:{list_name}:{request_id}"
+
+def _store_result_lists(response: CompanyResearchResponse, expire: int) -> None:
+    """Store the heavy result lists so they can be paged by request ID"""
+    if response.web_search_results:
+        redis_cache.set(
+            _result_list_key(response.request_id, "web_results"),
+            [result.model_dump(mode='json') for result in response.web_search_results],
+            expire=expire
+        )
+    if response.portfolio_data and response.portfolio_data.pages:
+        redis_cache.set(
+            _result_list_key(response.request_id, "portfolio_pages"),
+            response.portfolio_data.model_dump(mode='json', include={'pages'})['pages'],
+            expire=expire
+        )
+
+def _summarize_response(response: CompanyResearchResponse) -> CompanyResearchResponse:
+    """Copy of the response with the heavy lists trimmed to the top results"""
+    top_k = settings.RESEARCH_SUMMARY_TOP_K
+    update: Dict[str, Any] = {}
+    
+    if response.web_search_results:
+        update["web_search_results"] = response.web_search_results[:top_k]
+        update["web_search_results_total"] = len(response.web_search_results)
+    
+    if response.portfolio_data and response.portfolio_data.pages:
+        update["portfolio_data"] = response.portfolio_data.model_copy(
+            update={"pages": response.portfolio_data.pages[:top_k]}
+        )
+        update["portfolio_pages_total"] = len(response.portfolio_data.pages)
+    
+    return response.model_copy(update=update) if update else response
+
+def _get_results_page(request_id: str, list_name: str, offset: int, limit: int) -> ResearchResultsPage:
+    """Slice a stored research result list"""
+    items = redis_cache.get(_result_list_key(request_id, list_name))
+    if items is None:
+        raise HTTPException(status_code=404, detail="Research results not found or expired")
+    
+    return ResearchResultsPage(
+        request_id=request_id,
+        offset=offset,
+        limit=limit,
+        total=len(items),
+        items=items[offset:offset + limit]
+    )
+
+@router.get("/research/{request_id}/web-results", response_model=ResearchResultsPage)
+async def get_web_results(
+    request_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=settings.RESEARCH_PAGE_MAX_LIMIT)
+):
+    """Page through the full web search results of a research request"""
+    return _get_results_page(request_id, "web_results", offset, limit)
+
+@router.get("/research/{request_id}/portfolio-pages", response_model=ResearchResultsPage)
+async def get_portfolio_pages(
+    request_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=settings.RESEARCH_PAGE_MAX_LIMIT)
+):
+    """Page through the full scraped portfolio pages of a research request"""
+    return _get_results_page(request_id, "portfolio_pages", offset, limit)
+
 @router.post("/research/async", response_model=Dict[str, str])
 async def research_company_async(
     request: CompanyResearchRequest,
@@ -176,7 +296,7 @@ async def get_research_progress(request_id: str):
         if not progress:
             raise HTTPException(status_code=404, detail="Research request not found")
         
-        return progress
+        return _model_response(progress)
         
     except HTTPException:
         raise
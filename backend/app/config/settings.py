@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = False
+    WORKERS: int = 1
     
     # CORS Configuration
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -29,6 +30,14 @@ class Settings(BaseSettings):
         "http://192.168.1.7:3000"
     ]
     
+    # Middleware / Feature Flags
+    ENABLE_GZIP: bool = False  # Response compression (brotli with gzip fallback)
+    COMPRESSION_MINIMUM_SIZE: int = 2048  # Skip compressing small (e.g. auth) responses
+    BROTLI_QUALITY: int = 4
+    ENABLE_TRUSTEDHOST: bool = False
+    ENABLE_HEALTH_REDIS: bool = True
+    ALLOWED_HOSTS: List[str] = ["*"]
+    
     # Database Configuration
     DATABASE_URL: Optional[str] = None
     DATABASE_HOST: str = "localhost"
@@ -44,6 +53,7 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: Optional[str] = None
     REDIS_DB: int = 0
     REDIS_SSL: bool = True  # Upstash uses SSL
+    REDIS_TRUSTED_PICKLE: bool = False  # Store internal objects as pickle; only enable for a private Redis
     
     # LLM Configuration
     OPENAI_API_KEY: Optional[str] = None
@@ -61,6 +71,11 @@ class Settings(BaseSettings):
     # LLM Provider Selection
     DEFAULT_LLM_PROVIDER: str = "gemini"  # gemini, openai, anthropic, groq
     FALLBACK_LLM_PROVIDER: str = "openai"
+    # Concurrent requests allowed per LLM provider, kept under provider rate limits
+    LLM_MAX_CONCURRENCY: int = 8
+    
+    # Approximate input token budget for company research AI analysis prompts
+    AI_ANALYSIS_MAX_INPUT_TOKENS: int = 6000
     
     # Google API Configuration
     GOOGLE_KNOWLEDGE_GRAPH_API_KEY: Optional[str] = None
@@ -87,11 +102,55 @@ class Settings(BaseSettings):
     FREE_TIER_DAILY_LIMIT: int = 10
     PREMIUM_TIER_DAILY_LIMIT: int = 100
     
+    # Maximum research sources queried concurrently per request
+    RESEARCH_MAX_CONCURRENT_TASKS: int = 6
+    RESEARCH_PROGRESS_TTL_SECONDS: int = 300
+    RESEARCH_PROGRESS_MAX_LOCAL_SESSIONS: int = 10000
+    
+    # Company research result pagination
+    RESEARCH_SUMMARY_TOP_K: int = 5
+    RESEARCH_PAGE_MAX_LIMIT: int = 50
+    
+    # In-process research response cache in front of Redis (0 disables it)
+    RESEARCH_LOCAL_CACHE_TTL_SECONDS: int = 300
+    RESEARCH_LOCAL_CACHE_MAX_SIZE: int = 256
+    
+    # Per-source research results shared by concurrent and repeat lookups (0 disables it)
+    RESEARCH_SOURCE_CACHE_TTL_SECONDS: int = 300
+    RESEARCH_SOURCE_CACHE_MAX_SIZE: int = 128
+    
+    # Google Knowledge Graph search responses cached per query (0 disables it)
+    KNOWLEDGE_GRAPH_CACHE_TTL_SECONDS: int = 86400
+    KNOWLEDGE_GRAPH_CACHE_MAX_SIZE: int = 10000
+    # Same responses shared across workers and restarts through Redis (0 disables it)
+    KNOWLEDGE_GRAPH_SHARED_CACHE_TTL_SECONDS: int = 604800
+    # Entities requested per Knowledge Graph search; only the best one is used
+    KNOWLEDGE_GRAPH_RESULT_LIMIT: int = 3
+    
+    # Location verification results shared across workers through Redis (0 disables it)
+    LOCATION_VERIFICATION_CACHE_TTL_SECONDS: int = 172800
+    
     # JWT Configuration
     JWT_SECRET_KEY: str = "your-secret-key-change-in-production"
     JWT_ALGORITHM: str = "HS256"
+    # PEM keys for asymmetric algorithms (e.g. EdDSA with Ed25519); HS* use JWT_SECRET_KEY
+    JWT_PRIVATE_KEY: Optional[str] = None
+    JWT_PUBLIC_KEY: Optional[str] = None
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 1
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    BCRYPT_ROUNDS: int = 12
+    
+    # Decoded token claims cache (0 disables it)
+    TOKEN_DECODE_CACHE_TTL_SECONDS: float = 5.0
+    TOKEN_DECODE_CACHE_MAX_SIZE: int = 10000
+    
+    # Authenticated user snapshot cache
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 5000
+    
+    # Successful password verifications cache (0 disables it)
+    PASSWORD_VERIFY_CACHE_TTL_SECONDS: int = 300
+    PASSWORD_VERIFY_CACHE_MAX_SIZE: int = 2048
     
     # OAuth Configuration
     GOOGLE_CLIENT_ID: Optional[str] = None
@@ -2,6 +2,7 @@
 Database configuration and connection management
 Simple and clean database setup for JobHelp API
 """
+import asyncio
 import logging
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
@@ -92,3 +93,7 @@ def test_database_connection() -> dict:
             "status": "error",
             "message": f"Database connection failed: {str(e)}"
         }
+
+async def test_database_connection_async() -> dict:
+    """Run the database connection test in a worker thread to avoid blocking the event loop"""
+    return await asyncio.to_thread(test_database_connection)
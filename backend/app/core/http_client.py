@@ -0,0 +1,54 @@
+"""
+Shared HTTP clients
+Pooled httpx clients that multiplex requests over HTTP/2 when the h2 extra is installed
+"""
+from typing import List, Optional
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+def create_http_client(
+    timeout: float,
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20
+) -> httpx.AsyncClient:
+    """Create a pooled client so concurrent requests share (multiplexed) connections"""
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+    )
+
+# Every SharedHTTPClient, so shutdown can close them in one place
+_shared_clients: List["SharedHTTPClient"] = []
+
+class SharedHTTPClient:
+    """Module-level pooled client, created lazily on first use and closed at app shutdown"""
+    
+    def __init__(self, timeout: float, max_connections: int = 100, max_keepalive_connections: int = 20):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        _shared_clients.append(self)
+    
+    def get(self) -> httpx.AsyncClient:
+        """Get the pooled client, creating it if needed"""
+        if self._client is None or self._client.is_closed:
+            self._client = create_http_client(self.timeout, self.max_connections, self.max_keepalive_connections)
+        return self._client
+    
+    async def close(self) -> None:
+        """Close the pooled client"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+async def close_shared_http_clients() -> None:
+    """Close all shared HTTP clients"""
+    for shared_client in _shared_clients:
+        await shared_client.close()
@@ -2,8 +2,10 @@
 Redis caching service for JobHelp API
 Simple and efficient caching with Redis
 """
+import asyncio
 import logging
 import json
+import pickle
 from typing import Any, Optional, Union
 from datetime import datetime, date
 from redis import Redis, ConnectionPool
@@ -53,6 +55,17 @@ class RedisCache:
                     max_connections=10
                 )
             
+            # Separate client without response decoding for binary (pickle) payloads
+            self.binary_redis = Redis.from_url(
+                redis_url,
+                decode_responses=False,
+                socket_connect_timeout=10,
+                socket_timeout=10,
+                retry_on_timeout=True,
+                health_check_interval=30,
+                max_connections=10
+            )
+            
             # Test connection with ping
             self.redis.ping()
             logger.info(f"Redis connected successfully to {redis_url.split('@')[1] if '@' in redis_url else 'redis'}")
@@ -63,6 +76,7 @@ class RedisCache:
             logger.warning(f"Redis URL used: {settings.get_redis_url}")
             logger.warning("Redis caching will be disabled")
             self.redis = None
+            self.binary_redis = None
             self.connected = False
     
     def set(self, key: str, value: Any, expire: int = 3600) -> bool:
@@ -105,6 +119,40 @@ class RedisCache:
             logger.error(f"Redis get error for key {key}: {str(e)}")
             return None
     
+    def set_pickle(self, key: str, value: Any, expire: int = 3600) -> bool:
+        """
+        Set a pickled value with expiration
+        
+        Pickle is only safe against a trusted, private Redis instance, so this is a
+        no-op unless REDIS_TRUSTED_PICKLE is enabled.
+        """
+        if not self.connected or not settings.REDIS_TRUSTED_PICKLE:
+            return False
+        
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            self.binary_redis.setex(key, expire, payload)
+            logger.debug(f"Redis SET (pickle) successful - Key: {key}, Expire: {expire}s, Value size: {len(payload)} bytes")
+            return True
+        except (RedisError, pickle.PicklingError, TypeError) as e:
+            logger.error(f"Redis pickle set error for key {key}: {str(e)}")
+            return False
+    
+    def get_pickle(self, key: str) -> Optional[Any]:
+        """Get a pickled value by key (see set_pickle for the trust requirement)"""
+        if not self.connected or not settings.REDIS_TRUSTED_PICKLE:
+            return None
+        
+        try:
+            payload = self.binary_redis.get(key)
+            if payload is None:
+                logger.debug(f"Redis GET (pickle) miss - Key: {key} not found")
+                return None
+            return pickle.loads(payload)
+        except (RedisError, pickle.UnpicklingError, AttributeError, EOFError, ImportError) as e:
+            logger.error(f"Redis pickle get error for key {key}: {str(e)}")
+            return None
+    
     def delete(self, key: str) -> bool:
         """Delete a key"""
         if not self.connected:
@@ -163,6 +211,10 @@ class RedisCache:
                 "redis_type": "Redis"
             }
     
+    async def test_connection_async(self) -> dict:
+        """Run the Redis connection test in a worker thread to avoid blocking the event loop"""
+        return await asyncio.to_thread(self.test_connection)
+    
     def test_connection_detailed(self) -> dict:
         """Test Redis connection with detailed error information"""
         if not self.connected:
@@ -0,0 +1,32 @@
+"""
+Per-request context values
+Holds state captured once at request entry and shared by everything built while serving it
+"""
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+
+# UTC timestamp captured when the current request entered the app
+_request_now: ContextVar[Optional[datetime]] = ContextVar("request_now", default=None)
+
+def request_now() -> datetime:
+    """Get the current request's timestamp, falling back to the clock outside a request"""
+    now = _request_now.get()
+    return now if now is not None else datetime.utcnow()
+
+class RequestNowMiddleware:
+    """Pure ASGI middleware that captures a single UTC timestamp per request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_now.set(datetime.utcnow())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_now.reset(token)
@@ -2,7 +2,9 @@
 Simplified Authentication Middleware with Automatic Token Refresh
 Handles role-based authentication with seamless token refresh
 """
-from typing import Optional, List
+import time
+from collections import OrderedDict
+from typing import Optional, List, NamedTuple
 from fastapi import HTTPException, status, Depends, Request, Response, Cookie
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -16,6 +18,44 @@ from app.config.settings import settings
 # HTTP Bearer security scheme (optional)
 security = HTTPBearer(auto_error=False)
 
+class UserSnapshot(NamedTuple):
+    """Minimal authenticated user state kept in the in-process user cache"""
+    id: int
+    role: str
+    is_active: bool
+    is_verified: bool
+
+# LRU of user_id -> (expires_at, UserSnapshot)
+_user_snapshot_cache: "OrderedDict[int, tuple[float, UserSnapshot]]" = OrderedDict()
+
+def _cache_user_snapshot(user: User) -> UserSnapshot:
+    """Build a snapshot from an ORM user and store it in the cache"""
+    snapshot = UserSnapshot(user.id, user.role_value, user.is_active, user.is_verified)
+    _user_snapshot_cache[user.id] = (time.monotonic() + settings.USER_CACHE_TTL_SECONDS, snapshot)
+    _user_snapshot_cache.move_to_end(user.id)
+    if len(_user_snapshot_cache) > settings.USER_CACHE_MAX_SIZE:
+        _user_snapshot_cache.popitem(last=False)
+    return snapshot
+
+def _get_user_snapshot(user_id: int, db: Session) -> Optional[UserSnapshot]:
+    """Get an active user's snapshot from the cache, loading it from the database on a miss"""
+    cached = _user_snapshot_cache.get(user_id)
+    if cached is not None:
+        expires_at, snapshot = cached
+        if time.monotonic() < expires_at:
+            _user_snapshot_cache.move_to_end(user_id)
+            return snapshot
+        _user_snapshot_cache.pop(user_id, None)
+    
+    user = auth_service.get_user_by_id(user_id, db)
+    if not user:
+        return None
+    return _cache_user_snapshot(user)
+
+def invalidate_user_snapshot(user_id: int) -> None:
+    """Drop a cached user snapshot after the user's role or status changes"""
+    _user_snapshot_cache.pop(user_id, None)
+
 class SimpleAuthMiddleware:
     """Simplified authentication middleware with automatic token refresh"""
     
@@ -52,19 +92,19 @@ class SimpleAuthMiddleware:
         refresh_token: Optional[str],
         response: Response,
         db: Session
-    ) -> Optional[User]:
+    ) -> Optional[UserSnapshot]:
         """
         Authenticate user with automatic token refresh
-        Returns user if authenticated, None if not
+        Returns user snapshot if authenticated, None if not
         """
         # Try access token first
         if access_token:
             payload = jwt_service.validate_access_token(access_token)
             if payload:
                 user_id = int(payload.get("sub"))
-                user = auth_service.get_user_by_id(user_id, db)
-                if user and user.is_active:
-                    return user
+                snapshot = _get_user_snapshot(user_id, db)
+                if snapshot and snapshot.is_active:
+                    return snapshot
         
         # If access token is invalid/expired, try refresh token
         if refresh_token:
@@ -76,7 +116,7 @@ class SimpleAuthMiddleware:
                     # Generate new access token
                     new_access_token = jwt_service.create_access_token(user)
                     SimpleAuthMiddleware._set_access_token_cookie(response, new_access_token)
-                    return user
+                    return _cache_user_snapshot(user)
         
         return None
     
@@ -89,12 +129,15 @@ class SimpleAuthMiddleware:
             required_roles: List of allowed roles (None = any authenticated user)
             require_verified: Whether email verification is required
         """
+        # Compare raw role strings so the check never constructs enum objects
+        required_role_values = frozenset(role.value for role in required_roles) if required_roles else None
+        
         def auth_dependency(
             request: Request,
             response: Response,
             db: Session = Depends(get_db),
             tokens: tuple = Depends(SimpleAuthMiddleware._get_tokens_from_request)
-        ) -> User:
+        ) -> UserSnapshot:
             access_token, refresh_token = tokens
             
             # Authenticate with automatic refresh
@@ -124,7 +167,7 @@ class SimpleAuthMiddleware:
                 )
             
             # Check role permissions if specified
-            if required_roles and user.role not in required_roles:
+            if required_role_values and user.role not in required_role_values:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Insufficient permissions"
@@ -133,6 +176,30 @@ class SimpleAuthMiddleware:
             return user
         
         return auth_dependency
+    
+    @staticmethod
+    def create_full_user_dependency(snapshot_dependency):
+        """
+        Create a dependency that loads the full ORM user for routes that need it
+        
+        Args:
+            snapshot_dependency: Authentication dependency returning a UserSnapshot
+        """
+        def full_user_dependency(
+            snapshot: UserSnapshot = Depends(snapshot_dependency),
+            db: Session = Depends(get_db)
+        ) -> User:
+            user = auth_service.get_user_by_id(snapshot.id, db)
+            if not user:
+                invalidate_user_snapshot(snapshot.id)
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Authentication required",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            return user
+        
+        return full_user_dependency
 
 # Pre-configured authentication dependencies
 
@@ -153,13 +220,16 @@ require_verified_user = SimpleAuthMiddleware.create_auth_dependency(require_veri
 require_verified_applicant = SimpleAuthMiddleware.create_auth_dependency([UserRole.APPLICANT], require_verified=True)
 require_verified_recruiter = SimpleAuthMiddleware.create_auth_dependency([UserRole.RECRUITER], require_verified=True)
 
+# Full ORM user (only for routes that read or modify user fields)
+get_full_user = SimpleAuthMiddleware.create_full_user_dependency(require_auth)
+
 # Optional authentication (can return None)
 def optional_auth(
     request: Request,
     response: Response,
     db: Session = Depends(get_db),
     tokens: tuple = Depends(SimpleAuthMiddleware._get_tokens_from_request)
-) -> Optional[User]:
+) -> Optional[UserSnapshot]:
     """Optional authentication - returns user if authenticated, None otherwise"""
     access_token, refresh_token = tokens
     
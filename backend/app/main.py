@@ -2,22 +2,113 @@
 JobHelp AI API - Main Application
 Simple and clean FastAPI application with integrated health checks
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
-import logging
+from datetime import datetime, timezone
+import asyncio
+import time
+import orjson
+
+# Prefer brotli compression, fall back to gzip if brotli-asgi is not installed
+try:
+    from brotli_asgi import BrotliMiddleware
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 from app.config.settings import settings
-from app.core.logging.logger import setup_logging
+from app.core.logging.logger import get_logger  # configures logging once on import
 from app.api.v1.api import api_router
-from app.core.database import test_database_connection
+from app.core.database import test_database_connection_async
+from app.core.http_client import close_shared_http_clients
 from app.core.redis_cache import redis_cache
+from app.core.request_context import RequestNowMiddleware
+from app.services.auth.oauth_service import oauth_service
+from app.services.llm.llm_orchestrator import llm_orchestrator
+
+logger = get_logger(__name__)
+
+# Middleware configuration computed once at import time
+CORS_ALLOW_ORIGINS = tuple(settings.BACKEND_CORS_ORIGINS)
+CORS_ALLOW_METHODS = ("*",)
+CORS_ALLOW_HEADERS = ("*",)
+TRUSTED_HOSTS = tuple(settings.ALLOWED_HOSTS)
+
+# Health probe results are reused for a short window so frequent load balancer
+# checks don't translate into one DB + Redis round trip per request
+HEALTH_PROBE_TTL_SECONDS = 1.0
+_health_body_cache = {"expires_at": 0.0, "body": None}
+_health_probe_lock = asyncio.Lock()
+
+_REDIS_PROBE_DISABLED = {"status": "disabled", "redis_type": "Redis", "message": "Redis health probe disabled"}
+
+# Static part of the health payload, encoded once at import time
+_HEALTH_STATIC_FIELDS = orjson.dumps({
+    "service": settings.PROJECT_NAME,
+    "version": settings.VERSION
+})[1:-1]
+
+def _encode_health_body(db_status: dict, redis_status: dict) -> bytes:
+    """Encode the health payload, splicing in the pre-encoded static fields"""
+    db_ok = db_status["status"] == "success"
+    redis_disabled = redis_status["status"] == "disabled"
+    redis_ok = redis_status["status"] == "success" or redis_disabled
+    
+    # Determine overall status
+    if db_ok and redis_ok:
+        overall_status = "healthy"
+    elif db_ok or redis_ok:
+        overall_status = "degraded"
+    else:
+        overall_status = "unhealthy"
+    
+    dynamic_fields = orjson.dumps({
+        "database": {
+            "status": "connected" if db_ok else "disconnected",
+            "type": db_status.get("database_type", "Unknown"),
+            "message": db_status.get("message", "Unknown error")
+        },
+        "redis": {
+            "status": "disabled" if redis_disabled else ("connected" if redis_ok else "disconnected"),
+            "type": redis_status.get("redis_type", "Unknown"),
+            "message": redis_status.get("message", "Unknown error")
+        },
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    })
+    return b'{"status":' + orjson.dumps(overall_status) + b"," + _HEALTH_STATIC_FIELDS + b"," + dynamic_fields[1:]
+
+async def _get_health_body() -> bytes:
+    """Run DB and Redis probes concurrently, reusing the encoded body within the TTL window"""
+    now = time.monotonic()
+    if _health_body_cache["body"] is not None and now < _health_body_cache["expires_at"]:
+        return _health_body_cache["body"]
+    
+    async with _health_probe_lock:
+        # Another request may have refreshed the cache while we waited
+        now = time.monotonic()
+        if _health_body_cache["body"] is not None and now < _health_body_cache["expires_at"]:
+            return _health_body_cache["body"]
+        
+        if settings.ENABLE_HEALTH_REDIS:
+            db_status, redis_status = await asyncio.gather(
+                test_database_connection_async(),
+                redis_cache.test_connection_async()
+            )
+        else:
+            db_status, redis_status = await test_database_connection_async(), _REDIS_PROBE_DISABLED
+        
+        body = _encode_health_body(db_status, redis_status)
+        _health_body_cache["body"] = body
+        _health_body_cache["expires_at"] = time.monotonic() + HEALTH_PROBE_TTL_SECONDS
+        return body
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    setup_logging()
-    logger = logging.getLogger(__name__)
     logger.info("🚀 Starting JobHelp AI API...")
     logger.info(f"Environment: {'Development' if settings.DEBUG else 'Production'}")
     logger.info(f"Log level: {settings.LOG_LEVEL}")
@@ -25,6 +116,9 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("🛑 Shutting down JobHelp AI API...")
+    await oauth_service.close()
+    await llm_orchestrator.close()
+    await close_shared_http_clients()
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application"""
@@ -35,18 +129,37 @@ def create_app() -> FastAPI:
         version=settings.VERSION,
         docs_url="/docs",
         redoc_url="/redoc",
+        default_response_class=ORJSONResponse,
         lifespan=lifespan
     )
     
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.BACKEND_CORS_ORIGINS,
+        allow_origins=CORS_ALLOW_ORIGINS,
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=CORS_ALLOW_METHODS,
+        allow_headers=CORS_ALLOW_HEADERS,
     )
     
+    # Optional middleware controlled by feature flags
+    if settings.ENABLE_GZIP:
+        if BROTLI_AVAILABLE:
+            app.add_middleware(
+                BrotliMiddleware,
+                quality=settings.BROTLI_QUALITY,
+                minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+                gzip_fallback=True
+            )
+        else:
+            app.add_middleware(GZipMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+    
+    if settings.ENABLE_TRUSTEDHOST:
+        app.add_middleware(TrustedHostMiddleware, allowed_hosts=TRUSTED_HOSTS)
+    
+    # Capture one timestamp per request for response models built while serving it
+    app.add_middleware(RequestNowMiddleware)
+    
     # Include API routes
     app.include_router(api_router, prefix=settings.API_V1_STR)
     
@@ -55,36 +168,7 @@ def create_app() -> FastAPI:
     async def health_check():
         """Comprehensive health check including database and Redis status"""
         try:
-            # Test database connection
-            db_status = test_database_connection()
-            
-            # Test Redis connection
-            redis_status = redis_cache.test_connection()
-            
-            # Determine overall status
-            if db_status["status"] == "success" and redis_status["status"] == "success":
-                overall_status = "healthy"
-            elif db_status["status"] == "success" or redis_status["status"] == "success":
-                overall_status = "degraded"
-            else:
-                overall_status = "unhealthy"
-            
-            return {
-                "status": overall_status,
-                "service": settings.PROJECT_NAME,
-                "version": settings.VERSION,
-                "database": {
-                    "status": "connected" if db_status["status"] == "success" else "disconnected",
-                    "type": db_status.get("database_type", "Unknown"),
-                    "message": db_status.get("message", "Unknown error")
-                },
-                "redis": {
-                    "status": "connected" if redis_status["status"] == "success" else "disconnected",
-                    "type": redis_status.get("redis_type", "Unknown"),
-                    "message": redis_status.get("message", "Unknown error")
-                },
-                "timestamp": "2025-08-27T19:50:00Z"
-            }
+            return Response(content=await _get_health_body(), media_type="application/json")
                 
         except Exception as e:
             return {
@@ -99,7 +183,7 @@ def create_app() -> FastAPI:
                     "status": "error",
                     "error": str(e)
                 },
-                "timestamp": "2025-08-27T19:50:00Z"
+                "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
             }
     
     return app
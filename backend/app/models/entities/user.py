@@ -1,7 +1,8 @@
 """
 User entity model for authentication and authorization
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Index
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from app.core.database import Base
 import enum
@@ -28,11 +29,12 @@ class User(Base):
     
     # Authentication fields
     hashed_password = Column(String(255), nullable=True)  # Nullable for OAuth users
-    auth_provider = Column(Enum(AuthProvider, values_callable=lambda obj: [e.value for e in obj]), default=AuthProvider.LOCAL, nullable=False)
+    # Stored as plain strings; enum objects are only built on explicit attribute access
+    auth_provider_value = Column("auth_provider", String(16), default=AuthProvider.LOCAL.value, nullable=False)
     provider_id = Column(String(255), nullable=True, index=True)  # External provider ID
     
     # Authorization and status
-    role = Column(Enum(UserRole, values_callable=lambda obj: [e.value for e in obj]), default=UserRole.APPLICANT, nullable=False)
+    role_value = Column("role", String(16), default=UserRole.APPLICANT.value, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     is_verified = Column(Boolean, default=False, nullable=False)
     
@@ -46,5 +48,49 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     last_login = Column(DateTime(timezone=True), nullable=True)
     
+    @hybrid_property
+    def role(self) -> UserRole:
+        """User role as a UserRole enum"""
+        return UserRole(self.role_value)
+    
+    @role.setter
+    def role(self, value) -> None:
+        self.role_value = UserRole(value).value
+    
+    @role.expression
+    def role(cls):
+        return cls.role_value
+    
+    @hybrid_property
+    def auth_provider(self) -> AuthProvider:
+        """Authentication provider as an AuthProvider enum"""
+        return AuthProvider(self.auth_provider_value)
+    
+    @auth_provider.setter
+    def auth_provider(self, value) -> None:
+        self.auth_provider_value = AuthProvider(value).value
+    
+    @auth_provider.expression
+    def auth_provider(cls):
+        return cls.auth_provider_value
+    
+    # Partial unique indexes: token lookups hit an index that only holds outstanding tokens
+    __table_args__ = (
+        Index(
+            "ix_user_verification_token",
+            "verification_token",
+            unique=True,
+            postgresql_where=verification_token.isnot(None),
+            sqlite_where=verification_token.isnot(None)
+        ),
+        Index(
+            "ix_user_password_reset_token",
+            "password_reset_token",
+            unique=True,
+            postgresql_where=password_reset_token.isnot(None),
+            sqlite_where=password_reset_token.isnot(None)
+        ),
+    )
+    
     def __repr__(self):
-        return f"<User(id={self.id}, email='{self.email}', role='{self.role}')>"
+        return f"<User(id={self.id}, email='{self.email}', role='{self.role_value}')>"
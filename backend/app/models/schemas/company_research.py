@@ -1,12 +1,48 @@
 """
 Pydantic schemas for company research requests and responses
 """
-from typing import Optional, List, Dict, Any, Union
-from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Dict, Any, Union, Type, TypeVar
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing_extensions import TypedDict, Required
 from enum import Enum
 from datetime import datetime
 
-class ResearchSource(str, Enum):
+from app.core.request_context import request_now
+
+try:
+    from enum import StrEnum
+except ImportError:  # Python < 3.11
+    class StrEnum(str, Enum):
+        """Fallback StrEnum where members format as their value"""
+        def __str__(self) -> str:
+            return self.value
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+def build_trusted(model_cls: Type[ModelT], **kwargs: Any) -> ModelT:
+    """
+    Build a model from backend-produced data without re-running validation
+    
+    Only use this for data the backend assembled itself; untrusted input
+    (e.g. request bodies) must still go through normal validation.
+    """
+    return model_cls.model_construct(_fields_set=set(kwargs), **kwargs)
+
+class ResearchBaseModel(BaseModel):
+    """Base model for company research schemas with the validation extras switched off"""
+    model_config = ConfigDict(
+        extra='ignore',
+        validate_assignment=False,
+        frozen=False,
+        str_strip_whitespace=False,
+        populate_by_name=False,
+        arbitrary_types_allowed=False,
+        defer_build=False,
+        ser_json_timedelta='iso8601',
+        ser_json_bytes='utf8'
+    )
+
+class ResearchSource(StrEnum):
     """Available research data sources"""
     WHOIS = "whois"
     WEB_SEARCH = "web_search"
@@ -15,7 +51,7 @@ class ResearchSource(str, Enum):
     LOCATION_VERIFICATION = "location_verification"
     PORTFOLIO_RESEARCH = "portfolio_research"
 
-class ResearchStatus(str, Enum):
+class ResearchStatus(StrEnum):
     """Research task status"""
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -23,7 +59,7 @@ class ResearchStatus(str, Enum):
     FAILED = "failed"
     PARTIAL = "partial"
 
-class CompanyResearchRequest(BaseModel):
+class CompanyResearchRequest(ResearchBaseModel):
     """Request model for company research"""
     company_name: Optional[str] = Field(None, description="Company name to research")
     company_domain: Optional[str] = Field(None, description="Company domain to research")
@@ -40,23 +76,26 @@ class CompanyResearchRequest(BaseModel):
             raise ValueError("Either company_name or company_domain must be provided")
         return self
 
-class WHOISData(BaseModel):
+# Leaf structures below are internal sub-objects that never cross the API boundary
+# on their own, so they are plain TypedDicts rather than nested BaseModels
+
+class WHOISData(TypedDict, total=False):
     """WHOIS domain registration data"""
-    domain: str
-    registrar: Optional[str] = None
-    creation_date: Optional[datetime] = None
-    expiration_date: Optional[datetime] = None
-    updated_date: Optional[datetime] = None
-    status: List[str] = []
-    name_servers: List[str] = []
-    registrant_organization: Optional[str] = None
-    registrant_country: Optional[str] = None
-    admin_contact: Optional[Dict[str, str]] = None
-    tech_contact: Optional[Dict[str, str]] = None
-    dnssec: Optional[str] = None
-    last_checked: datetime = Field(default_factory=datetime.utcnow)
+    domain: Required[str]
+    registrar: Optional[str]
+    creation_date: Optional[datetime]
+    expiration_date: Optional[datetime]
+    updated_date: Optional[datetime]
+    status: List[str]
+    name_servers: List[str]
+    registrant_organization: Optional[str]
+    registrant_country: Optional[str]
+    admin_contact: Optional[Dict[str, str]]
+    tech_contact: Optional[Dict[str, str]]
+    dnssec: Optional[str]
+    last_checked: datetime
 
-class WebSearchResult(BaseModel):
+class WebSearchResult(ResearchBaseModel):
     """Web search result data"""
     title: str
     url: str
@@ -66,59 +105,59 @@ class WebSearchResult(BaseModel):
     relevance_score: Optional[float] = None
     content_type: str = "web_page"  # web_page, news, social_media, etc.
 
-class KnowledgeGraphData(BaseModel):
+class KnowledgeGraphData(TypedDict, total=False):
     """Google Knowledge Graph entity data"""
-    entity_id: Optional[str] = None
-    name: str
-    description: Optional[str] = None
-    entity_type: Optional[str] = None
-    industry: Optional[str] = None
-    founded_date: Optional[str] = None
-    headquarters: Optional[str] = None
-    ceo: Optional[str] = None
-    employees: Optional[str] = None
-    revenue: Optional[str] = None
-    website: Optional[str] = None
-    social_media: Optional[Dict[str, str]] = None
-    subsidiaries: Optional[List[str]] = None
-    competitors: Optional[List[str]] = None
+    entity_id: Optional[str]
+    name: Required[str]
+    description: Optional[str]
+    entity_type: Optional[str]
+    industry: Optional[str]
+    founded_date: Optional[str]
+    headquarters: Optional[str]
+    ceo: Optional[str]
+    employees: Optional[str]
+    revenue: Optional[str]
+    website: Optional[str]
+    social_media: Optional[Dict[str, str]]
+    subsidiaries: Optional[List[str]]
+    competitors: Optional[List[str]]
 
-class CompanyAuthenticity(BaseModel):
+class CompanyAuthenticity(TypedDict, total=False):
     """Company authenticity assessment"""
-    domain_age_days: Optional[int] = None
-    domain_reputation_score: Optional[float] = None
-    social_presence_score: Optional[float] = None
-    news_mentions_count: Optional[int] = None
-    employee_reviews_count: Optional[int] = None
-    authenticity_score: Optional[float] = None
-    risk_factors: List[str] = []
-    trust_indicators: List[str] = []
-    overall_assessment: str = "unknown"  # trustworthy, suspicious, unknown
+    domain_age_days: Optional[int]
+    domain_reputation_score: Optional[float]
+    social_presence_score: Optional[float]
+    news_mentions_count: Optional[int]
+    employee_reviews_count: Optional[int]
+    authenticity_score: Optional[float]
+    risk_factors: List[str]
+    trust_indicators: List[str]
+    overall_assessment: str  # trustworthy, suspicious, unknown
 
-class CompanyGrowth(BaseModel):
+class CompanyGrowth(TypedDict, total=False):
     """Company growth indicators"""
-    employee_growth_trend: Optional[str] = None
-    funding_rounds: Optional[List[Dict[str, Any]]] = None
+    employee_growth_trend: Optional[str]
+    funding_rounds: Optional[List[Dict[str, Any]]]
 
-class PortfolioPageData(BaseModel):
+class PortfolioPageData(TypedDict):
     """Data from a single portfolio page"""
     url: str
     title: str
     text: str
     scraped_at: datetime
 
-class PortfolioSummary(BaseModel):
+class PortfolioSummary(TypedDict, total=False):
     """Portfolio summary data"""
-    summary: str
-    method: str  # "llm" or "nlp"
-    model_used: Optional[str] = None
-    key_phrases: Optional[List[str]] = None
-    entities: Optional[Dict[str, List[str]]] = None
-    techniques_used: Optional[List[str]] = None
-    error: Optional[str] = None
-    generated_at: datetime
+    summary: Required[str]
+    method: Required[str]  # "llm" or "nlp"
+    model_used: Optional[str]
+    key_phrases: Optional[List[str]]
+    entities: Optional[Dict[str, List[str]]]
+    techniques_used: Optional[List[str]]
+    error: Optional[str]
+    generated_at: Required[datetime]
 
-class PortfolioData(BaseModel):
+class PortfolioData(ResearchBaseModel):
     """Complete portfolio research data"""
     domain: str
     pages: List[PortfolioPageData]
@@ -137,44 +176,44 @@ class PortfolioData(BaseModel):
     market_position: Optional[str] = None
     growth_score: Optional[float] = None
 
-class EmployeeInsights(BaseModel):
+class EmployeeInsights(TypedDict, total=False):
     """Employee-related insights"""
-    review_sentiment: Optional[str] = None
-    common_pros: List[str] = []
-    common_cons: List[str] = []
-    work_life_balance_score: Optional[float] = None
-    career_growth_score: Optional[float] = None
-    compensation_score: Optional[float] = None
-    management_score: Optional[float] = None
-    overall_rating: Optional[float] = None
-    review_count: Optional[int] = None
+    review_sentiment: Optional[str]
+    common_pros: List[str]
+    common_cons: List[str]
+    work_life_balance_score: Optional[float]
+    career_growth_score: Optional[float]
+    compensation_score: Optional[float]
+    management_score: Optional[float]
+    overall_rating: Optional[float]
+    review_count: Optional[int]
 
-class LocationData(BaseModel):
+class LocationData(TypedDict, total=False):
     """Location information from a single source"""
-    source: str  # "google_places" or "nominatim_osm"
-    address: Optional[str] = None
-    city: Optional[str] = None
-    state: Optional[str] = None
-    country: Optional[str] = None
-    postal_code: Optional[str] = None
-    latitude: Optional[float] = None
-    longitude: Optional[float] = None
-    formatted_address: Optional[str] = None
-    place_id: Optional[str] = None
-    confidence_score: Optional[float] = None
-    last_updated: datetime = Field(default_factory=datetime.utcnow)
+    source: Required[str]  # "google_places" or "nominatim_osm"
+    address: Optional[str]
+    city: Optional[str]
+    state: Optional[str]
+    country: Optional[str]
+    postal_code: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    formatted_address: Optional[str]
+    place_id: Optional[str]
+    confidence_score: Optional[float]
+    last_updated: datetime
 
-class LocationComparison(BaseModel):
+class LocationComparison(TypedDict, total=False):
     """Comparison results between location sources"""
-    address_similarity_score: float = Field(0.0, description="Address similarity score (0-1)")
-    coordinate_distance_km: Optional[float] = Field(None, description="Distance between coordinates in km")
-    city_match: bool = Field(False, description="Whether cities match")
-    state_match: bool = Field(False, description="Whether states match")
-    country_match: bool = Field(False, description="Whether countries match")
-    postal_code_match: bool = Field(False, description="Whether postal codes match")
-    overall_location_confidence: float = Field(0.0, description="Overall location confidence score (0-1)")
+    address_similarity_score: float  # Address similarity score (0-1)
+    coordinate_distance_km: Optional[float]  # Distance between coordinates in km
+    city_match: bool
+    state_match: bool
+    country_match: bool
+    postal_code_match: bool
+    overall_location_confidence: float  # Overall location confidence score (0-1)
 
-class LocationVerificationData(BaseModel):
+class LocationVerificationData(ResearchBaseModel):
     """Complete location verification data"""
     company_name: str
     search_query: str
@@ -185,9 +224,9 @@ class LocationVerificationData(BaseModel):
     verification_status: str = Field("unknown", description="verified, suspicious, unknown")
     risk_factors: List[str] = []
     trust_indicators: List[str] = []
-    last_verified: datetime = Field(default_factory=datetime.utcnow)
+    last_verified: datetime = Field(default_factory=request_now)
 
-class ResearchTaskResult(BaseModel):
+class ResearchTaskResult(ResearchBaseModel):
     """Individual research task result"""
     source: ResearchSource
     status: ResearchStatus
@@ -195,9 +234,9 @@ class ResearchTaskResult(BaseModel):
     error_message: Optional[str] = None
     processing_time: float
     cost_estimate: Optional[float] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=request_now)
 
-class CompanyResearchResponse(BaseModel):
+class CompanyResearchResponse(ResearchBaseModel):
     """Complete company research response"""
     # Request identification
     request_id: str
@@ -231,15 +270,27 @@ class CompanyResearchResponse(BaseModel):
     total_cost: Optional[float] = None
     sources_used: List[ResearchSource]
     failed_sources: List[ResearchSource]
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=request_now)
     
     # Authenticity scoring
     authenticity_score: float = Field(0.0, description="Overall company authenticity score (0-100)")
     
     # Task-level results
     task_results: List[ResearchTaskResult]
+    
+    # Full list sizes when the heavy lists are trimmed for a summary response
+    web_search_results_total: Optional[int] = None
+    portfolio_pages_total: Optional[int] = None
+
+class ResearchResultsPage(ResearchBaseModel):
+    """One page of a stored research result list"""
+    request_id: str
+    offset: int
+    limit: int
+    total: int
+    items: List[Dict[str, Any]]
 
-class ResearchProgress(BaseModel):
+class ResearchProgress(ResearchBaseModel):
     """Research progress tracking"""
     request_id: str
     company_name: str
@@ -250,7 +301,7 @@ class ResearchProgress(BaseModel):
     estimated_completion_time: Optional[float] = None
     status: ResearchStatus = ResearchStatus.PENDING
 
-class ResearchCostEstimate(BaseModel):
+class ResearchCostEstimate(ResearchBaseModel):
     """Cost estimation for research"""
     estimated_total_cost: float
     cost_breakdown: Dict[ResearchSource, float]
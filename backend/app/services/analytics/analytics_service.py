@@ -1,6 +1,7 @@
 """
 Analytics service for orchestrating different types of analysis
 """
+import asyncio
 import logging
 import time
 from typing import Dict, Any, Optional
@@ -50,23 +51,31 @@ class AnalyticsService:
         try:
             logger.info(f"Starting {analysis_type.value} analysis for user {user_id}")
             
-            # Basic analytics (always performed)
-            basic_analytics = self._perform_basic_analysis(resume_content, job_description_content)
+            # The analyses are independent, so the CPU-bound ones run in worker
+            # threads while the AI analysis awaits the LLM
+            tasks = [
+                # Basic analytics (always performed)
+                asyncio.to_thread(self._perform_basic_analysis, resume_content, job_description_content),
+                # Experience analysis (if available)
+                asyncio.to_thread(self._perform_experience_analysis, resume_content),
+            ]
             
             # Advanced analytics (for advanced and AI-enhanced)
-            advanced_analytics = None
-            if analysis_type in [AnalysisType.ADVANCED, AnalysisType.AI_ENHANCED]:
-                advanced_analytics = self._perform_advanced_analysis(resume_content, job_description_content)
+            run_advanced = analysis_type in [AnalysisType.ADVANCED, AnalysisType.AI_ENHANCED]
+            if run_advanced:
+                tasks.append(asyncio.to_thread(self._perform_advanced_analysis, resume_content, job_description_content))
             
             # AI-enhanced analytics (only for AI-enhanced type)
-            ai_insights = None
-            if analysis_type == AnalysisType.AI_ENHANCED:
-                ai_insights = await self._perform_ai_enhanced_analysis(
+            run_ai = analysis_type == AnalysisType.AI_ENHANCED
+            if run_ai:
+                tasks.append(self._perform_ai_enhanced_analysis(
                     resume_content, job_description_content, user_id, is_premium
-                )
+                ))
             
-            # Experience analysis (if available)
-            experience_analysis = self._perform_experience_analysis(resume_content)
+            results = await asyncio.gather(*tasks)
+            basic_analytics, experience_analysis = results[0], results[1]
+            advanced_analytics = results[2] if run_advanced else None
+            ai_insights = results[-1] if run_ai else None
             
             processing_time = time.time() - start_time
             
@@ -103,10 +112,7 @@ class AnalyticsService:
             similarity_score = self.text_analyzer.calculate_similarity(resume_content, jd_content)
             
             # Keyword analysis
-            jd_keywords = set(jd_freq.keys())
-            resume_keywords = set(resume_freq.keys())
-            common_keywords = list(jd_keywords.intersection(resume_keywords))
-            missing_keywords = list(jd_keywords - resume_keywords)
+            common_keywords, missing_keywords = self.text_analyzer.compare_keywords(jd_freq, resume_freq)
             
             return {
                 "similarity_score": similarity_score,
@@ -137,15 +143,11 @@ class AnalyticsService:
             )
             
             # Skills matching
-            matched_skills = list(
-                set(resume_skills['hard_skills']).intersection(set(jd_skills['hard_skills']))
-            )
-            missing_skills = list(
-                set(jd_skills['hard_skills']) - set(resume_skills['hard_skills'])
-            )
-            extra_skills = list(
-                set(resume_skills['hard_skills']) - set(jd_skills['hard_skills'])
-            )
+            resume_hard_skills = set(resume_skills['hard_skills'])
+            jd_hard_skills = set(jd_skills['hard_skills'])
+            matched_skills = list(resume_hard_skills & jd_hard_skills)
+            missing_skills = list(jd_hard_skills - resume_hard_skills)
+            extra_skills = list(resume_hard_skills - jd_hard_skills)
             
             return {
                 "semantic_similarity_score": semantic_similarity,
@@ -2,16 +2,23 @@
 Authentication Service
 Handles user authentication, registration, and session management
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import HTTPException, status
 
 from app.models.entities.user import User, UserRole, AuthProvider
 from app.models.schemas.auth import UserRegister, UserLogin, OAuthUserInfo
 from app.services.auth.jwt_service import jwt_service
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
+
+# Single worker keeps last-login writes off the login path and applies them in order
+_last_login_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="last-login")
 
 class AuthService:
     """Authentication service for user management"""
@@ -21,59 +28,47 @@ class AuthService:
     
     def register_user(self, user_data: UserRegister, db: Session) -> User:
         """Register a new user with email/password"""
-        try:
-            # Check if user already exists
-            existing_user = db.query(User).filter(User.email == user_data.email).first()
-            if existing_user:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="User with this email already exists"
-                )
-            
-            # Create new user
-            hashed_password = self.jwt_service.hash_password(user_data.password)
-            verification_token = self.jwt_service.generate_verification_token()
-            
-            user = User(
-                email=user_data.email,
-                full_name=user_data.full_name,
-                hashed_password=hashed_password,
-                auth_provider=AuthProvider.LOCAL,
-                verification_token=verification_token,
-                role=user_data.role
-            )
-            
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            
-            # Send verification email
-            try:
-                from app.services.email_service import email_service
-                if email_service:
-                    email_service.send_verification_email(
-                        user.email, 
-                        user.full_name or "User", 
-                        verification_token
-                    )
-            except Exception as e:
-                # Log error but don't fail registration
-                print(f"Failed to send verification email: {str(e)}")
-            
-            return user
-            
-        except IntegrityError:
+        # Create new user; an existing email is detected by the insert itself
+        hashed_password = self.jwt_service.hash_password(user_data.password)
+        verification_token = self.jwt_service.generate_verification_token()
+        
+        user = self._insert_user_if_absent(db, {
+            "email": user_data.email,
+            "full_name": user_data.full_name,
+            "hashed_password": hashed_password,
+            "auth_provider_value": AuthProvider.LOCAL.value,
+            "verification_token": verification_token,
+            "role_value": UserRole(user_data.role).value
+        })
+        if user is None:
             db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User with this email already exists"
             )
+        
+        db.commit()
+        
+        # Send verification email
+        try:
+            from app.services.email_service import email_service
+            if email_service:
+                email_service.send_verification_email(
+                    user.email, 
+                    user.full_name or "User", 
+                    verification_token
+                )
+        except Exception as e:
+            # Log error but don't fail registration
+            print(f"Failed to send verification email: {str(e)}")
+        
+        return user
     
     def authenticate_user(self, credentials: UserLogin, db: Session) -> Optional[User]:
         """Authenticate user with email/password"""
         user = db.query(User).filter(
             User.email == credentials.email,
-            User.auth_provider == AuthProvider.LOCAL
+            User.auth_provider == AuthProvider.LOCAL.value
         ).first()
         
         if not user:
@@ -91,63 +86,114 @@ class AuthService:
                 detail="Account is deactivated"
             )
         
-        # Update last login
-        user.last_login = datetime.utcnow()
-        db.commit()
+        # Update last login outside the request transaction
+        self._record_last_login(user)
         
         return user
     
     def create_oauth_user(self, oauth_info: OAuthUserInfo, db: Session) -> User:
         """Create or update user from OAuth provider"""
-        try:
-            # Check if user exists by email
-            existing_user = db.query(User).filter(User.email == oauth_info.email).first()
+        # Check if user exists by email
+        existing_user = db.query(User).filter(User.email == oauth_info.email).first()
+        
+        if existing_user:
+            # Update existing user with OAuth info
+            if existing_user.auth_provider_value != oauth_info.provider.value:
+                # User exists with different provider - link accounts
+                existing_user.provider_id = oauth_info.provider_id
+                existing_user.is_verified = oauth_info.verified
+            else:
+                # Update provider info
+                existing_user.provider_id = oauth_info.provider_id
             
-            if existing_user:
-                # Update existing user with OAuth info
-                if existing_user.auth_provider != oauth_info.provider:
-                    # User exists with different provider - link accounts
-                    existing_user.provider_id = oauth_info.provider_id
-                    existing_user.is_verified = oauth_info.verified
-                else:
-                    # Update provider info
-                    existing_user.provider_id = oauth_info.provider_id
-                
-                existing_user.last_login = datetime.utcnow()
+            # Only commit when the provider info actually changed
+            if db.is_modified(existing_user):
                 db.commit()
-                return existing_user
-            
-            # Create new OAuth user
-            user = User(
-                email=oauth_info.email,
-                full_name=oauth_info.name,
-                auth_provider=oauth_info.provider,
-                provider_id=oauth_info.provider_id,
-                is_verified=oauth_info.verified,
-                role=UserRole.APPLICANT,
-                last_login=datetime.utcnow()
-            )
+                # Linking may have changed is_verified, which the auth middleware caches
+                self._invalidate_cached_user(existing_user.id)
             
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            
-            return user
-            
-        except IntegrityError:
+            self._record_last_login(existing_user)
+            return existing_user
+        
+        # Create new OAuth user; a concurrent signup with the same email is caught by the insert
+        user = self._insert_user_if_absent(db, {
+            "email": oauth_info.email,
+            "full_name": oauth_info.name,
+            "auth_provider_value": AuthProvider(oauth_info.provider).value,
+            "provider_id": oauth_info.provider_id,
+            "is_verified": oauth_info.verified,
+            "role_value": UserRole.APPLICANT.value,
+            "last_login": datetime.utcnow()
+        })
+        if user is None:
             db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Error creating user account"
             )
+        
+        db.commit()
+        
+        return user
+    
+    def _insert_user_if_absent(self, db: Session, values: Dict[str, Any]) -> Optional[User]:
+        """
+        Insert a user with INSERT ... ON CONFLICT (email) DO NOTHING RETURNING
+        
+        Returns the created user with server defaults populated, or None if the
+        email is already registered.
+        """
+        if db.get_bind().dialect.name == "sqlite":
+            stmt = sqlite_insert(User)
+        else:
+            stmt = postgresql_insert(User)
+        
+        stmt = stmt.values(**values).on_conflict_do_nothing(index_elements=[User.email]).returning(User)
+        return db.scalars(stmt).first()
+    
+    def _record_last_login(self, user: User) -> None:
+        """Set last login on the loaded user and persist it in the background"""
+        last_login = datetime.utcnow()
+        # Reflect the value on the instance without marking it dirty in the request session
+        set_committed_value(user, "last_login", last_login)
+        _last_login_executor.submit(self._update_last_login, user.id, last_login)
+    
+    @staticmethod
+    def _invalidate_cached_user(user_id: int) -> None:
+        """Drop the auth middleware's cached snapshot after a change to role, is_active or is_verified"""
+        # Imported here because the middleware imports this module
+        from app.core.simple_auth_middleware import invalidate_user_snapshot
+        invalidate_user_snapshot(user_id)
+    
+    @staticmethod
+    def _update_last_login(user_id: int, last_login: datetime) -> None:
+        """Write last login with a single UPDATE on a short-lived session"""
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(last_login=last_login)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Failed to update last login for user {user_id}: {str(e)}")
+        finally:
+            db.close()
     
     def get_user_by_id(self, user_id: int, db: Session) -> Optional[User]:
         """Get user by ID"""
-        return db.query(User).filter(User.id == user_id, User.is_active == True).first()
+        return db.execute(
+            select(User).where(User.id == user_id, User.is_active == True)
+        ).scalar_one_or_none()
     
     def get_user_by_email(self, email: str, db: Session) -> Optional[User]:
         """Get user by email"""
-        return db.query(User).filter(User.email == email, User.is_active == True).first()
+        return db.execute(
+            select(User).where(User.email == email, User.is_active == True)
+        ).scalar_one_or_none()
     
     def refresh_access_token(self, refresh_token: str, db: Session) -> Optional[Dict[str, Any]]:
         """Generate new access token from refresh token"""
@@ -173,7 +219,7 @@ class AuthService:
     def initiate_password_reset(self, email: str, db: Session) -> Optional[User]:
         """Initiate password reset process"""
         user = self.get_user_by_email(email, db)
-        if not user or user.auth_provider != AuthProvider.LOCAL:
+        if not user or user.auth_provider_value != AuthProvider.LOCAL.value:
             return None
         
         # Generate reset token
@@ -202,10 +248,13 @@ class AuthService:
     
     def reset_password(self, token: str, new_password: str, db: Session) -> Optional[User]:
         """Reset user password with token"""
-        user = db.query(User).filter(
-            User.password_reset_token == token,
-            User.password_reset_expires > datetime.utcnow()
-        ).first()
+        # Expiry is compared in the database against its own clock
+        user = db.execute(
+            select(User).where(
+                User.password_reset_token == token,
+                User.password_reset_expires > func.now()
+            )
+        ).scalar_one_or_none()
         
         if not user:
             return None
@@ -220,7 +269,9 @@ class AuthService:
     
     def verify_email(self, token: str, db: Session) -> Optional[User]:
         """Verify user email with token"""
-        user = db.query(User).filter(User.verification_token == token).first()
+        user = db.execute(
+            select(User).where(User.verification_token == token)
+        ).scalar_one_or_none()
         
         if not user:
             return None
@@ -229,6 +280,7 @@ class AuthService:
         user.verification_token = None
         
         db.commit()
+        self._invalidate_cached_user(user.id)
         
         # Send welcome email
         try:
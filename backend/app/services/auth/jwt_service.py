@@ -2,62 +2,197 @@
 JWT Authentication Service
 Handles token creation, validation, and refresh functionality
 """
+from calendar import timegm
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from fastapi.concurrency import run_in_threadpool
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-import secrets
+import jwt as pyjwt  # PyJWT, used for EdDSA which python-jose does not implement
+import base64
+import binascii
+import bcrypt
+import hashlib
+import hmac
+import orjson
+import os
+import threading
+import time
 
 from app.config.settings import settings
 from app.models.entities.user import User
 
+# Random bytes drawn per os.urandom call for token IDs and one-time tokens
+_RANDOM_BUFFER_SIZE = 4096
+_TOKEN_BYTES = 32
+
+# HMAC algorithms signed inline with a precomputed header
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url encoding used by JWS"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _b64url_decode(data: bytes) -> bytes:
+    """Decode an unpadded base64url segment"""
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
 class JWTService:
     """JWT token management service"""
     
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.bcrypt_rounds = settings.BCRYPT_ROUNDS
         self.secret_key = settings.JWT_SECRET_KEY
         self.algorithm = settings.JWT_ALGORITHM
         self.access_token_expire_minutes = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES
         self.refresh_token_expire_days = settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS
+        
+        # Asymmetric algorithms sign with the private key and verify with the public key
+        self._signing_key = settings.JWT_PRIVATE_KEY or self.secret_key
+        self._verification_key = settings.JWT_PUBLIC_KEY or self.secret_key
+        self._use_pyjwt = self.algorithm == "EdDSA"
+        
+        # The algorithm is fixed at startup, so HMAC tokens reuse one encoded header
+        self._hmac_digest = _HMAC_DIGESTS.get(self.algorithm)
+        if self._hmac_digest is not None:
+            self._header_b64 = _b64url(orjson.dumps({"alg": self.algorithm, "typ": "JWT"}))
+            self._hmac_key = self._signing_key.encode("utf-8")
+        
+        self._access_delta = timedelta(minutes=self.access_token_expire_minutes)
+        self._refresh_delta = timedelta(days=self.refresh_token_expire_days)
+        
+        # Claim templates; copying keeps the key layout instead of rebuilding it per token
+        self._access_template: Dict[str, Any] = {
+            "sub": None, "email": None, "role": None, "exp": None, "iat": None, "type": "access"
+        }
+        self._refresh_template: Dict[str, Any] = {
+            "sub": None, "exp": None, "iat": None, "type": "refresh", "jti": None
+        }
+        
+        # Recently verified (hash, keyed digest of password) pairs; plaintext is never stored
+        self._verify_cache_key = hashlib.blake2b(self.secret_key.encode()).digest()
+        self._verify_cache: "OrderedDict[Tuple[str, bytes], float]" = OrderedDict()
+        self._verify_cache_lock = threading.Lock()
+        
+        # Recently decoded tokens: sha256(token) -> (expires_at, claims)
+        self._decode_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._decode_cache_lock = threading.Lock()
+        
+        # OS entropy fetched in bulk and handed out once, front to back
+        self._rand_buf = b""
+        self._rand_offset = 0
+        self._rand_lock = threading.Lock()
+        # A forked worker must never replay bytes its parent (or a sibling) already used
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_random_buffer)
+    
+    def _reset_random_buffer(self) -> None:
+        """Discard buffered entropy"""
+        self._rand_lock = threading.Lock()
+        self._rand_buf = b""
+        self._rand_offset = 0
+    
+    def _randbytes(self, n: int) -> bytes:
+        """Return n unused bytes from the entropy buffer, refilling it when depleted"""
+        with self._rand_lock:
+            if self._rand_offset + n > len(self._rand_buf):
+                self._rand_buf = os.urandom(max(_RANDOM_BUFFER_SIZE, n))
+                self._rand_offset = 0
+            start = self._rand_offset
+            self._rand_offset = start + n
+            return self._rand_buf[start:self._rand_offset]
+    
+    def _token_urlsafe(self) -> str:
+        """Equivalent of secrets.token_urlsafe(32) served from the entropy buffer"""
+        return _b64url(self._randbytes(_TOKEN_BYTES)).decode("ascii")
+    
+    @staticmethod
+    def _password_bytes(password: str) -> bytes:
+        """Encode a password for bcrypt, which only uses the first 72 bytes"""
+        # Truncate explicitly like passlib did, so existing hashes keep verifying
+        return password.encode("utf-8")[:72]
     
     def hash_password(self, password: str) -> str:
         """Hash a password"""
-        return self.pwd_context.hash(password)
+        return bcrypt.hashpw(self._password_bytes(password), bcrypt.gensalt(rounds=self.bcrypt_rounds)).decode("utf-8")
+    
+    def _check_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Run the bcrypt check, treating malformed hashes as a mismatch"""
+        try:
+            return bcrypt.checkpw(self._password_bytes(plain_password), hashed_password.encode("utf-8"))
+        except ValueError:
+            return False
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash"""
-        return self.pwd_context.verify(plain_password, hashed_password)
+        if settings.PASSWORD_VERIFY_CACHE_MAX_SIZE <= 0:
+            return self._check_password(plain_password, hashed_password)
+        
+        # A new password gets a new salted hash, so resets invalidate entries naturally
+        cache_key = (
+            hashed_password,
+            hashlib.blake2b(plain_password.encode(), key=self._verify_cache_key).digest()
+        )
+        now = time.monotonic()
+        with self._verify_cache_lock:
+            expires_at = self._verify_cache.get(cache_key)
+            if expires_at is not None:
+                if now < expires_at:
+                    self._verify_cache.move_to_end(cache_key)
+                    return True
+                self._verify_cache.pop(cache_key, None)
+        
+        if not self._check_password(plain_password, hashed_password):
+            # Failures are not cached so every wrong guess still pays the full bcrypt cost
+            return False
+        
+        with self._verify_cache_lock:
+            self._verify_cache[cache_key] = now + settings.PASSWORD_VERIFY_CACHE_TTL_SECONDS
+            self._verify_cache.move_to_end(cache_key)
+            if len(self._verify_cache) > settings.PASSWORD_VERIFY_CACHE_MAX_SIZE:
+                self._verify_cache.popitem(last=False)
+        return True
+    
+    async def hash_password_async(self, password: str) -> str:
+        """Hash a password in a worker thread so bcrypt doesn't block the event loop"""
+        return await run_in_threadpool(self.hash_password, password)
+    
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password in a worker thread so bcrypt doesn't block the event loop"""
+        return await run_in_threadpool(self.verify_password, plain_password, hashed_password)
     
     def create_access_token(self, user: User) -> str:
         """Create JWT access token"""
-        expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
-        payload = {
-            "sub": str(user.id),
-            "email": user.email,
-            "role": user.role.value,
-            "exp": expire,
-            "iat": datetime.utcnow(),
-            "type": "access"
-        }
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        return self._create_access_token(user, datetime.utcnow())
+    
+    def _create_access_token(self, user: User, now: datetime) -> str:
+        """Create JWT access token issued at the given time"""
+        payload = self._access_template.copy()
+        payload["sub"] = str(user.id)
+        payload["email"] = user.email
+        payload["role"] = user.role_value
+        payload["exp"] = now + self._access_delta
+        payload["iat"] = now
+        return self._encode(payload)
     
     def create_refresh_token(self, user: User) -> str:
         """Create JWT refresh token"""
-        expire = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
-        payload = {
-            "sub": str(user.id),
-            "exp": expire,
-            "iat": datetime.utcnow(),
-            "type": "refresh",
-            "jti": secrets.token_urlsafe(32)  # Unique token ID
-        }
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        return self._create_refresh_token(user, datetime.utcnow())
+    
+    def _create_refresh_token(self, user: User, now: datetime) -> str:
+        """Create JWT refresh token issued at the given time"""
+        payload = self._refresh_template.copy()
+        payload["sub"] = str(user.id)
+        payload["exp"] = now + self._refresh_delta
+        payload["iat"] = now
+        payload["jti"] = self._token_urlsafe()  # Unique token ID
+        return self._encode(payload)
     
     def create_token_pair(self, user: User) -> Dict[str, Any]:
         """Create access and refresh token pair"""
-        access_token = self.create_access_token(user)
-        refresh_token = self.create_refresh_token(user)
+        now = datetime.utcnow()
+        access_token = self._create_access_token(user, now)
+        refresh_token = self._create_refresh_token(user, now)
         
         return {
             "access_token": access_token,
@@ -66,16 +201,115 @@ class JWTService:
             "expires_in": self.access_token_expire_minutes * 60
         }
     
+    def _encode(self, payload: Dict[str, Any]) -> str:
+        """Sign a JWT payload with the configured algorithm"""
+        if self._hmac_digest is not None:
+            return self._encode_hmac(payload)
+        if self._use_pyjwt:
+            return pyjwt.encode(payload, self._signing_key, algorithm=self.algorithm)
+        return jwt.encode(payload, self._signing_key, algorithm=self.algorithm)
+    
+    def _encode_hmac(self, payload: Dict[str, Any]) -> str:
+        """Sign an HS* token directly, skipping jose's per-call header handling"""
+        # Registered time claims are NumericDate values, as jose would convert them
+        for claim in ("exp", "iat", "nbf"):
+            value = payload.get(claim)
+            if isinstance(value, datetime):
+                payload[claim] = timegm(value.utctimetuple())
+        
+        signing_input = self._header_b64 + b"." + _b64url(orjson.dumps(payload))
+        signature = hmac.new(self._hmac_key, signing_input, self._hmac_digest).digest()
+        return (signing_input + b"." + _b64url(signature)).decode("ascii")
+    
+    def _decode_hmac(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verify an HS* token directly, applying the same claim checks jose would"""
+        try:
+            header_b64, payload_b64, signature_b64 = token.encode("ascii").split(b".")
+            header = orjson.loads(_b64url_decode(header_b64))
+            if not isinstance(header, dict) or header.get("alg") != self.algorithm:
+                return None
+            
+            expected = hmac.new(self._hmac_key, header_b64 + b"." + payload_b64, self._hmac_digest).digest()
+            if not hmac.compare_digest(expected, _b64url_decode(signature_b64)):
+                return None
+            
+            payload = orjson.loads(_b64url_decode(payload_b64))
+        except (ValueError, binascii.Error, orjson.JSONDecodeError):
+            return None
+        if not isinstance(payload, dict):
+            return None
+        
+        now = int(time.time())
+        for claim in ("exp", "nbf", "iat"):
+            value = payload.get(claim)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+                return None
+        if "exp" in payload and payload["exp"] < now:
+            return None
+        if "nbf" in payload and payload["nbf"] > now:
+            return None
+        # No audience is configured, so jose rejects any token that names one
+        if "aud" in payload:
+            return None
+        for claim in ("sub", "jti"):
+            if claim in payload and not isinstance(payload[claim], str):
+                return None
+        return payload
+    
+    def _decode(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verify a JWT signature and claims, returning None when invalid"""
+        if self._hmac_digest is not None:
+            return self._decode_hmac(token)
+        try:
+            if self._use_pyjwt:
+                return pyjwt.decode(token, self._verification_key, algorithms=[self.algorithm])
+            return jwt.decode(token, self._verification_key, algorithms=[self.algorithm])
+        except (JWTError, pyjwt.PyJWTError):
+            return None
+    
     def decode_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Decode and validate JWT token"""
+        if settings.TOKEN_DECODE_CACHE_MAX_SIZE <= 0:
+            return self._decode(token)
+        
+        cache_key = hashlib.sha256(token.encode()).digest()
+        now = time.monotonic()
+        with self._decode_cache_lock:
+            cached = self._decode_cache.get(cache_key)
+            if cached is not None:
+                expires_at, payload = cached
+                # Re-check exp so a cached entry never outlives the token itself
+                if now < expires_at and payload.get("exp", 0) > time.time():
+                    self._decode_cache.move_to_end(cache_key)
+                    return dict(payload)
+                self._decode_cache.pop(cache_key, None)
+        
+        payload = self._decode(token)
+        if payload is None:
+            # Invalid tokens are never cached
+            return None
+        
+        with self._decode_cache_lock:
+            self._decode_cache[cache_key] = (now + settings.TOKEN_DECODE_CACHE_TTL_SECONDS, payload)
+            self._decode_cache.move_to_end(cache_key)
+            if len(self._decode_cache) > settings.TOKEN_DECODE_CACHE_MAX_SIZE:
+                self._decode_cache.popitem(last=False)
+        return dict(payload)
+    
+    @staticmethod
+    def _peek_type(token: str) -> Optional[str]:
+        """Read the unverified type claim; only ever used to reject tokens early"""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
-        except JWTError:
+            payload = orjson.loads(_b64url_decode(token.encode("ascii").split(b".")[1]))
+        except (ValueError, IndexError, binascii.Error, orjson.JSONDecodeError):
             return None
+        return payload.get("type") if isinstance(payload, dict) else None
     
     def validate_access_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Validate access token and return payload"""
+        # Wrong-type or malformed tokens are refused before paying for signature checks
+        if self._peek_type(token) != "access":
+            return None
         payload = self.decode_token(token)
         if payload and payload.get("type") == "access":
             return payload
@@ -83,6 +317,8 @@ class JWTService:
     
     def validate_refresh_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Validate refresh token and return payload"""
+        if self._peek_type(token) != "refresh":
+            return None
         payload = self.decode_token(token)
         if payload and payload.get("type") == "refresh":
             return payload
@@ -90,11 +326,11 @@ class JWTService:
     
     def generate_password_reset_token(self) -> str:
         """Generate secure password reset token"""
-        return secrets.token_urlsafe(32)
+        return self._token_urlsafe()
     
     def generate_verification_token(self) -> str:
         """Generate email verification token"""
-        return secrets.token_urlsafe(32)
+        return self._token_urlsafe()
 
 # Global JWT service instance
 jwt_service = JWTService()
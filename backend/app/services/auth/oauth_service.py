@@ -2,13 +2,14 @@
 OAuth Service
 Handles OAuth authentication with Google and other providers
 """
+import asyncio
 from typing import Optional, Dict, Any
-import httpx
 from fastapi import HTTPException, status
 from authlib.integrations.starlette_client import OAuth
 from authlib.integrations.starlette_client import OAuthError
 
 from app.config.settings import settings
+from app.core.http_client import create_http_client
 from app.models.entities.user import AuthProvider
 from app.models.schemas.auth import OAuthUserInfo
 
@@ -18,6 +19,13 @@ class OAuthService:
     def __init__(self):
         self.oauth = OAuth()
         self._setup_providers()
+        
+        # Shared pooled client so callbacks reuse connections to the provider APIs
+        self._client = create_http_client(timeout=10.0)
+    
+    async def close(self):
+        """Close the shared HTTP client"""
+        await self._client.aclose()
     
     def _setup_providers(self):
         """Setup OAuth providers"""
@@ -68,12 +76,11 @@ class OAuthService:
             user_info = token.get('userinfo')
             if not user_info:
                 # Fallback: fetch user info manually
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        'https://www.googleapis.com/oauth2/v2/userinfo',
-                        headers={'Authorization': f'Bearer {token["access_token"]}'}
-                    )
-                    user_info = response.json()
+                response = await self._client.get(
+                    'https://www.googleapis.com/oauth2/v2/userinfo',
+                    headers={'Authorization': f'Bearer {token["access_token"]}'}
+                )
+                user_info = response.json()
             
             # Create OAuth user info
             oauth_user = OAuthUserInfo(
@@ -103,31 +110,25 @@ class OAuthService:
             github = self.oauth.create_client('github')
             token = await github.authorize_access_token(request)
             
-            # Get user info from GitHub
-            async with httpx.AsyncClient() as client:
-                # Get user profile
-                user_response = await client.get(
-                    'https://api.github.com/user',
-                    headers={'Authorization': f'token {token["access_token"]}'}
-                )
-                user_data = user_response.json()
-                
-                # Get user email (GitHub may not provide email in profile)
-                email_response = await client.get(
-                    'https://api.github.com/user/emails',
-                    headers={'Authorization': f'token {token["access_token"]}'}
-                )
-                emails = email_response.json()
-                
-                # Find primary email
-                primary_email = None
-                for email_info in emails:
-                    if email_info.get('primary', False):
-                        primary_email = email_info['email']
-                        break
-                
-                if not primary_email and emails:
-                    primary_email = emails[0]['email']
+            # Get user profile and emails from GitHub concurrently
+            # (GitHub may not provide email in profile)
+            headers = {'Authorization': f'token {token["access_token"]}'}
+            user_response, email_response = await asyncio.gather(
+                self._client.get('https://api.github.com/user', headers=headers),
+                self._client.get('https://api.github.com/user/emails', headers=headers)
+            )
+            user_data = user_response.json()
+            emails = email_response.json()
+            
+            # Find primary email
+            primary_email = None
+            for email_info in emails:
+                if email_info.get('primary', False):
+                    primary_email = email_info['email']
+                    break
+            
+            if not primary_email and emails:
+                primary_email = emails[0]['email']
             
             oauth_user = OAuthUserInfo(
                 email=primary_email,
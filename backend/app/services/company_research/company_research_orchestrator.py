@@ -5,14 +5,21 @@ Coordinates multiple research sources and manages the research pipeline
 import asyncio
 import logging
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, NamedTuple, Tuple
 from datetime import datetime
 import uuid
 
+from pydantic import TypeAdapter
+
 from app.models.schemas.company_research import (
     CompanyResearchRequest, CompanyResearchResponse, ResearchSource, 
-    ResearchStatus, ResearchTaskResult, ResearchProgress, ResearchCostEstimate
+    ResearchStatus, ResearchTaskResult, ResearchProgress, ResearchCostEstimate,
+    WHOISData, WebSearchResult, KnowledgeGraphData, LocationVerificationData,
+    CompanyAuthenticity, CompanyGrowth, EmployeeInsights, PortfolioData,
+    build_trusted
 )
+from app.config.settings import settings
+from .research_progress_store import ResearchProgressStore
 from .research_sources.whois_service import WHOISService
 from .research_sources.web_search_service import WebSearchService
 from .research_sources.knowledge_graph_service import KnowledgeGraphService
@@ -22,6 +29,19 @@ from .research_sources.portfolio_research_service import PortfolioResearchServic
 
 logger = logging.getLogger(__name__)
 
+# Validators for the TypedDict leaf payloads (built once, reused per request)
+_whois_adapter = TypeAdapter(WHOISData)
+_knowledge_graph_adapter = TypeAdapter(KnowledgeGraphData)
+_authenticity_adapter = TypeAdapter(CompanyAuthenticity)
+_growth_adapter = TypeAdapter(CompanyGrowth)
+_employee_insights_adapter = TypeAdapter(EmployeeInsights)
+
+class ResearchPlan(NamedTuple):
+    """Research pipeline resolved once per research depth (shared by all requests, so immutable)"""
+    sources: Tuple[ResearchSource, ...]
+    task_sources: Tuple[ResearchSource, ...]  # sources with a registered service
+    run_ai_analysis: bool
+
 class CompanyResearchOrchestrator:
     """Orchestrates company research across multiple data sources"""
     
@@ -43,8 +63,41 @@ class CompanyResearchOrchestrator:
             "comprehensive": [ResearchSource.WHOIS, ResearchSource.WEB_SEARCH, ResearchSource.KNOWLEDGE_GRAPH, ResearchSource.LOCATION_VERIFICATION, ResearchSource.PORTFOLIO_RESEARCH, ResearchSource.AI_ANALYSIS]
         }
         
-        # Active research sessions
-        self.active_research_sessions: Dict[str, ResearchProgress] = {}
+        # Resolve each depth's pipeline once instead of per request
+        self.research_plans: Dict[str, ResearchPlan] = {
+            depth: ResearchPlan(
+                sources=tuple(sources),
+                # AI analysis runs on the other sources' results, so it is kept out of the parallel batch
+                task_sources=tuple(
+                    source for source in sources
+                    if source in self.research_sources and source != ResearchSource.AI_ANALYSIS
+                ),
+                run_ai_analysis=ResearchSource.AI_ANALYSIS in sources
+            )
+            for depth, sources in self.pipeline_config.items()
+        }
+        
+        # Source costs are fixed once services are configured, so estimates are computed once
+        self._cost_breakdowns: Dict[str, Dict[str, float]] = {
+            depth: {
+                source.value: self.research_sources[source].get_cost_estimate()
+                for source in plan.sources
+                if source in self.research_sources
+            }
+            for depth, plan in self.research_plans.items()
+        }
+        self._depth_costs: Dict[str, float] = {
+            depth: sum(breakdown.values()) for depth, breakdown in self._cost_breakdowns.items()
+        }
+        self._cost_estimates: Dict[str, ResearchCostEstimate] = {
+            depth: self._build_cost_estimate(depth) for depth in self.pipeline_config
+        }
+        
+        # Research progress, shared across workers and expired by TTL
+        self.progress_store = ResearchProgressStore(
+            ttl_seconds=settings.RESEARCH_PROGRESS_TTL_SECONDS,
+            max_size=settings.RESEARCH_PROGRESS_MAX_LOCAL_SESSIONS
+        )
         
     async def research_company(self, request: CompanyResearchRequest) -> CompanyResearchResponse:
         """Perform comprehensive company research"""
@@ -52,30 +105,38 @@ class CompanyResearchOrchestrator:
         request_id = str(uuid.uuid4())
         
         # Initialize research progress
-        progress = ResearchProgress(
+        progress = build_trusted(
+            ResearchProgress,
             request_id=request_id,
             company_name=request.company_name or request.company_domain or "Unknown Company",
             overall_progress=0.0,
+            completed_tasks=[],
+            failed_tasks=[],
             status=ResearchStatus.IN_PROGRESS
         )
-        self.active_research_sessions[request_id] = progress
+        await self.progress_store.save(progress)
         
         try:
-            # Determine research sources based on depth
-            research_sources = self.pipeline_config.get(request.research_depth, self.pipeline_config["standard"])
+            # Determine research plan based on depth
+            plan = self.research_plans.get(request.research_depth, self.research_plans["standard"])
+            research_sources = plan.sources
             
             # Execute research tasks in parallel
             task_results = await self._execute_research_pipeline(
-                request, research_sources, progress
+                request, plan.task_sources, progress
             )
             
             # Aggregate research data
             research_data = self._aggregate_research_data(task_results)
             
             # Perform AI analysis if available
-            if ResearchSource.AI_ANALYSIS in research_sources:
-                ai_analysis = await self._perform_ai_analysis(request, research_data, task_results)
-                research_data.update(ai_analysis)
+            if plan.run_ai_analysis and ResearchSource.AI_ANALYSIS in self.research_sources:
+                ai_result = await self._perform_ai_analysis(request, research_data, task_results)
+                task_results.append(ai_result)
+                if ai_result.status == ResearchStatus.COMPLETED and ai_result.data:
+                    research_data[ResearchSource.AI_ANALYSIS.value] = ai_result.data
+                else:
+                    progress.failed_tasks.append(ResearchSource.AI_ANALYSIS)
             
             # Build final response
             response = self._build_research_response(request, research_data, task_results, start_time, request_id)
@@ -83,7 +144,9 @@ class CompanyResearchOrchestrator:
             # Update progress
             progress.overall_progress = 100.0
             progress.status = ResearchStatus.COMPLETED
-            progress.completed_tasks = research_sources
+            # Copy: the plan is shared by every request, and progress lists get mutated
+            progress.completed_tasks = list(research_sources)
+            await self.progress_store.save(progress)
             
             return response
             
@@ -92,56 +155,54 @@ class CompanyResearchOrchestrator:
             # Update progress
             progress.status = ResearchStatus.FAILED
             progress.overall_progress = 0.0
+            await self.progress_store.save(progress)
             
             # Return partial response if possible
             return self._build_error_response(request, str(e), start_time, request_id)
-        
-        finally:
-            # Clean up active session after some time
-            asyncio.create_task(self._cleanup_session(request_id))
     
     async def _execute_research_pipeline(
         self, 
         request: CompanyResearchRequest, 
-        research_sources: List[ResearchSource],
+        research_sources: Tuple[ResearchSource, ...],
         progress: ResearchProgress
     ) -> List[ResearchTaskResult]:
         """Execute research pipeline with parallel processing"""
-        task_results = []
         total_sources = len(research_sources)
+        semaphore = asyncio.Semaphore(settings.RESEARCH_MAX_CONCURRENT_TASKS)
         
-        # Create research tasks
-        research_tasks = []
-        for source in research_sources:
-            if source in self.research_sources:
-                task = self._execute_research_task(request, source)
-                research_tasks.append(task)
-        
-        # Execute tasks with progress tracking
-        for i, task in enumerate(asyncio.as_completed(research_tasks)):
-            try:
-                result = await task
-                task_results.append(result)
-                
-                # Update progress
-                progress.overall_progress = ((i + 1) / total_sources) * 100
-                progress.completed_tasks.append(result.source)
-                
-                if result.status == ResearchStatus.FAILED:
-                    progress.failed_tasks.append(result.source)
-                
-            except Exception as e:
-                logger.error(f"Research task failed: {str(e)}")
+        async def run_task(source: ResearchSource) -> ResearchTaskResult:
+            async with semaphore:
+                result = await self._execute_research_task(request, source)
+            
+            # Update progress as each task finishes
+            progress.completed_tasks.append(result.source)
+            progress.overall_progress = (len(progress.completed_tasks) / total_sources) * 100
+            if result.status == ResearchStatus.FAILED:
+                progress.failed_tasks.append(result.source)
+            await self.progress_store.save(progress)
+            return result
+        
+        # Results come back in submission order, so each one maps to its source
+        results = await asyncio.gather(
+            *(run_task(source) for source in research_sources),
+            return_exceptions=True
+        )
+        
+        task_results = []
+        for source, result in zip(research_sources, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Research task failed: {str(result)}")
                 # Create failed result
-                failed_result = ResearchTaskResult(
-                    source=research_sources[i] if i < len(research_sources) else ResearchSource.WHOIS,
+                result = build_trusted(
+                    ResearchTaskResult,
+                    source=source,
                     status=ResearchStatus.FAILED,
-                    error_message=str(e),
+                    error_message=str(result),
                     processing_time=0.0,
                     cost_estimate=0.0
                 )
-                task_results.append(failed_result)
-                progress.failed_tasks.append(failed_result.source)
+                progress.failed_tasks.append(source)
+            task_results.append(result)
         
         return task_results
     
@@ -156,24 +217,15 @@ class CompanyResearchOrchestrator:
             raise ValueError(f"Research source {source} not available")
         
         try:
-            # Execute research with service-specific parameters
-            if source == ResearchSource.AI_ANALYSIS:
-                # AI analysis needs aggregated data from other sources
-                return await research_service.execute_research(
-                    request.company_name or "",
-                    request.company_domain,
-                    research_data={},  # Will be populated later
-                    task_results=[]     # Will be populated later
-                )
-            else:
-                return await research_service.execute_research(
-                    request.company_name or "",
-                    request.company_domain
-                )
+            return await research_service.execute_research(
+                request.company_name or "",
+                request.company_domain
+            )
                 
         except Exception as e:
             logger.error(f"Research task {source} failed: {str(e)}")
-            return ResearchTaskResult(
+            return build_trusted(
+                ResearchTaskResult,
                 source=source,
                 status=ResearchStatus.FAILED,
                 error_message=str(e),
@@ -197,22 +249,26 @@ class CompanyResearchOrchestrator:
         request: CompanyResearchRequest, 
         research_data: Dict[str, Any],
         task_results: List[ResearchTaskResult]
-    ) -> Dict[str, Any]:
+    ) -> ResearchTaskResult:
         """Perform AI analysis on aggregated research data"""
         try:
-            ai_service = self.research_sources.get(ResearchSource.AI_ANALYSIS)
-            if ai_service:
-                ai_result = await ai_service.research(
-                    request.company_name or "",
-                    request.company_domain,
-                    research_data=research_data,
-                    task_results=task_results
-                )
-                return ai_result
+            ai_service = self.research_sources[ResearchSource.AI_ANALYSIS]
+            return await ai_service.execute_research(
+                request.company_name or "",
+                request.company_domain,
+                research_data=research_data,
+                task_results=task_results
+            )
         except Exception as e:
             logger.error(f"AI analysis failed: {str(e)}")
-        
-        return {}
+            return build_trusted(
+                ResearchTaskResult,
+                source=ResearchSource.AI_ANALYSIS,
+                status=ResearchStatus.FAILED,
+                error_message=str(e),
+                processing_time=0.0,
+                cost_estimate=0.0
+            )
     
     def _build_research_response(
         self, 
@@ -228,6 +284,7 @@ class CompanyResearchOrchestrator:
         web_search_results = research_data.get("web_search", {}).get("search_results", [])
         knowledge_graph_data = research_data.get("knowledge_graph", {})
         location_verification_data = research_data.get("location_verification", {})
+        portfolio_data = self._flatten_portfolio_result(research_data.get("portfolio_research", {}))
         
         # Extract AI analysis results
         ai_results = research_data.get("ai_analysis", {})
@@ -236,18 +293,26 @@ class CompanyResearchOrchestrator:
         risk_assessment = ai_results.get("risk_assessment", "Risk assessment completed")
         recommendations = ai_results.get("recommendations", ["Review all data carefully"])
         
+        # Source payloads originate from third-party APIs and LLM output, so they are
+        # validated once here; the envelope itself is assembled from trusted values
+        company_authenticity = ai_results.get("company_authenticity")
+        company_growth = ai_results.get("company_growth")
+        employee_insights = ai_results.get("employee_insights")
+        
         # Build response
-        response = CompanyResearchResponse(
+        response = build_trusted(
+            CompanyResearchResponse,
             request_id=request_id,
             company_name=request.company_name or request.company_domain or "Unknown Company",
             company_domain=request.company_domain,
-            whois_data=whois_data if whois_data else None,
-            web_search_results=web_search_results if web_search_results else None,
-            knowledge_graph_data=knowledge_graph_data if knowledge_graph_data else None,
-            location_verification_data=location_verification_data if location_verification_data else None,
-            company_authenticity=ai_results.get("company_authenticity"),
-            company_growth=ai_results.get("company_growth"),
-            employee_insights=ai_results.get("employee_insights"),
+            whois_data=_whois_adapter.validate_python(whois_data) if whois_data else None,
+            web_search_results=[WebSearchResult.model_validate(r) for r in web_search_results] if web_search_results else None,
+            knowledge_graph_data=_knowledge_graph_adapter.validate_python(knowledge_graph_data) if knowledge_graph_data else None,
+            location_verification_data=LocationVerificationData.model_validate(location_verification_data) if location_verification_data else None,
+            company_authenticity=_authenticity_adapter.validate_python(company_authenticity) if company_authenticity else None,
+            company_growth=_growth_adapter.validate_python(company_growth) if company_growth else None,
+            employee_insights=_employee_insights_adapter.validate_python(employee_insights) if employee_insights else None,
+            portfolio_data=PortfolioData.model_validate(portfolio_data) if portfolio_data else None,
             executive_summary=executive_summary,
             key_insights=key_insights,
             risk_assessment=risk_assessment,
@@ -264,6 +329,21 @@ class CompanyResearchOrchestrator:
         
         return response
     
+    def _flatten_portfolio_result(self, portfolio_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Merge the scraped portfolio data and its summaries into the PortfolioData shape"""
+        scraped = portfolio_result.get("portfolio_data")
+        if not scraped:
+            return None
+        
+        return {
+            **scraped,
+            "llm_summary": portfolio_result.get("llm_summary"),
+            "nlp_summary": portfolio_result.get("nlp_summary"),
+            "scraped_at": portfolio_result.get("scraped_at"),
+            "total_pages_scraped": portfolio_result.get("total_pages_scraped", 0),
+            "total_content_length": portfolio_result.get("total_content_length", 0)
+        }
+    
     def _build_error_response(
         self, 
         request: CompanyResearchRequest, 
@@ -272,7 +352,8 @@ class CompanyResearchOrchestrator:
         request_id: str
     ) -> CompanyResearchResponse:
         """Build error response when research fails"""
-        return CompanyResearchResponse(
+        return build_trusted(
+            CompanyResearchResponse,
             request_id=request_id,
             company_name=request.company_name or request.company_domain or "Unknown Company",
             company_domain=request.company_domain,
@@ -292,11 +373,8 @@ class CompanyResearchOrchestrator:
     
     def _calculate_total_cost(self, task_results: List[ResearchTaskResult]) -> float:
         """Calculate total cost of research"""
-        total_cost = 0.0
-        for result in task_results:
-            if result.cost_estimate:
-                total_cost += result.cost_estimate
-        return total_cost
+        # At most one result per source, so a plain sum beats any array round trip
+        return sum(result.cost_estimate or 0.0 for result in task_results)
     
     def _calculate_authenticity_score(self, research_data: Dict[str, Any], task_results: List[ResearchTaskResult]) -> float:
         """Calculate overall authenticity score based on research results"""
@@ -337,28 +415,32 @@ class CompanyResearchOrchestrator:
     
     async def get_research_progress(self, request_id: str) -> Optional[ResearchProgress]:
         """Get research progress for a specific request"""
-        return self.active_research_sessions.get(request_id)
+        return await self.progress_store.get(request_id)
     
     async def cancel_research(self, request_id: str) -> bool:
         """Cancel ongoing research"""
-        if request_id in self.active_research_sessions:
-            progress = self.active_research_sessions[request_id]
-            progress.status = ResearchStatus.FAILED
-            progress.overall_progress = 0.0
-            return True
-        return False
+        progress = await self.progress_store.get(request_id)
+        if progress is None:
+            return False
+        
+        progress.status = ResearchStatus.FAILED
+        progress.overall_progress = 0.0
+        await self.progress_store.save(progress)
+        return True
     
     def get_cost_estimate(self, research_depth: str = "standard") -> ResearchCostEstimate:
         """Get cost estimate for research"""
+        cost_estimate = self._cost_estimates.get(research_depth)
+        if cost_estimate is None:
+            # Unknown depths have no sources; not cached to keep the table bounded
+            cost_estimate = self._build_cost_estimate(research_depth)
+        return cost_estimate
+    
+    def _build_cost_estimate(self, research_depth: str) -> ResearchCostEstimate:
+        """Build the cost estimate for a research depth from the precomputed cost tables"""
         sources = self.pipeline_config.get(research_depth, [])
-        cost_breakdown = {}
-        total_cost = 0.0
-        
-        for source in sources:
-            if source in self.research_sources:
-                cost = self.research_sources[source].get_cost_estimate()
-                cost_breakdown[source.value] = cost
-                total_cost += cost
+        cost_breakdown = dict(self._cost_breakdowns.get(research_depth, {}))
+        total_cost = self._depth_costs.get(research_depth, 0.0)
         
         # Cost optimization tips
         optimization_tips = []
@@ -390,14 +472,7 @@ class CompanyResearchOrchestrator:
     
     def _calculate_depth_cost(self, depth: str) -> float:
         """Calculate cost for specific research depth"""
-        sources = self.pipeline_config.get(depth, [])
-        total_cost = 0.0
-        
-        for source in sources:
-            if source in self.research_sources:
-                total_cost += self.research_sources[source].get_cost_estimate()
-        
-        return total_cost
+        return self._depth_costs.get(depth, 0.0)
     
     def get_service_health(self) -> Dict[str, Any]:
         """Get health status of all research services"""
@@ -410,28 +485,25 @@ class CompanyResearchOrchestrator:
     
     async def test_all_services(self) -> Dict[str, bool]:
         """Test all research services"""
-        test_results = {}
+        sources = list(self.research_sources)
+        # Probes are independent network round trips, so run them side by side
+        results = await asyncio.gather(
+            *(self.research_sources[source].test_connection() for source in sources),
+            return_exceptions=True
+        )
         
-        for source, service in self.research_sources.items():
-            try:
-                result = await service.test_connection()
-                test_results[source.value] = result
-            except Exception as e:
-                logger.error(f"Service test failed for {source}: {str(e)}")
-                test_results[source.value] = False
+        test_results = {}
+        for source, result in zip(sources, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Service test failed for {source}: {str(result)}")
+                result = False
+            test_results[source.value] = result
         
         return test_results
     
-    async def _cleanup_session(self, request_id: str, delay_seconds: int = 300):
-        """Clean up research session after delay"""
-        await asyncio.sleep(delay_seconds)
-        if request_id in self.active_research_sessions:
-            del self.active_research_sessions[request_id]
-            logger.info(f"Cleaned up research session: {request_id}")
-    
     def get_active_sessions_count(self) -> int:
         """Get count of active research sessions"""
-        return len(self.active_research_sessions)
+        return self.progress_store.count_active()
     
     def get_available_research_depths(self) -> List[str]:
         """Get available research depth options"""
@@ -0,0 +1,79 @@
+"""
+Research Progress Store
+Shares research progress across workers through Redis, with an in-process fallback
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.models.schemas.company_research import ResearchProgress, ResearchStatus
+from app.core.redis_cache import redis_cache
+
+logger = logging.getLogger(__name__)
+
+class ResearchProgressStore:
+    """TTL-bound research progress store backed by Redis"""
+    
+    KEY_PREFIX = "company_research:progress"
+    
+    def __init__(self, ttl_seconds: int = 300, max_size: int = 10000):
+        """Initialize the store; entries expire ttl_seconds after their last update"""
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        # request_id -> (expires_at, progress) for sessions owned by this worker, oldest first
+        self._local: "OrderedDict[str, Tuple[float, ResearchProgress]]" = OrderedDict()
+    
+    def _key(self, request_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{request_id}"
+    
+    def _purge_expired(self, now: float) -> None:
+        """Drop expired local entries (kept in update order, so only the front can expire)"""
+        while self._local:
+            request_id, (expires_at, _) = next(iter(self._local.items()))
+            if expires_at > now:
+                break
+            self._local.popitem(last=False)
+    
+    async def save(self, progress: ResearchProgress) -> None:
+        """Store the latest progress snapshot"""
+        now = time.monotonic()
+        self._local[progress.request_id] = (now + self.ttl_seconds, progress)
+        self._local.move_to_end(progress.request_id)
+        self._purge_expired(now)
+        # Bound memory under bursts; evicted sessions are still readable from Redis
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+        
+        if not redis_cache.connected:
+            return
+        # Serialize on the loop so the snapshot can't change mid-write; the blocking client runs in a thread
+        payload = progress.model_dump_json()
+        await asyncio.to_thread(redis_cache.set, self._key(progress.request_id), payload, self.ttl_seconds)
+    
+    async def get(self, request_id: str) -> Optional[ResearchProgress]:
+        """Get progress, preferring this worker's live copy over Redis"""
+        self._purge_expired(time.monotonic())
+        cached = self._local.get(request_id)
+        if cached is not None:
+            return cached[1]
+        
+        if not redis_cache.connected:
+            return None
+        payload = await asyncio.to_thread(redis_cache.get, self._key(request_id))
+        if not payload:
+            return None
+        try:
+            return ResearchProgress.model_validate(payload)
+        except Exception as e:
+            logger.warning(f"Stored research progress for {request_id} could not be parsed: {str(e)}")
+            return None
+    
+    def count_active(self) -> int:
+        """Count in-progress sessions owned by this worker"""
+        self._purge_expired(time.monotonic())
+        return sum(
+            1 for _, progress in self._local.values()
+            if progress.status == ResearchStatus.IN_PROGRESS
+        )
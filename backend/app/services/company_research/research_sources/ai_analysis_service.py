@@ -4,27 +4,113 @@ Synthesizes research data and generates comprehensive insights using LLM
 """
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import re
+from string import Formatter
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
-import json
+import orjson
+from pydantic import BaseModel
 
 from .base_research_source import BaseResearchSource
 from app.models.schemas.company_research import (
-    ResearchSource, CompanyAuthenticity, CompanyGrowth, 
+    ResearchSource, ResearchStatus, CompanyAuthenticity, CompanyGrowth, 
     EmployeeInsights, ResearchTaskResult
 )
-from app.services.llm.llm_orchestrator import LLMOrchestrator
+from app.services.llm.llm_orchestrator import llm_orchestrator
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Search result fields the analysis prompts actually use
+_WEB_RESULT_FIELDS = ("title", "url", "snippet", "source", "published_date", "content_type")
+_MAX_PROMPT_WEB_RESULTS = 20
+
+# Task result fields the authenticity prompts use
+_TASK_RESULT_FIELDS = {"source", "status", "processing_time", "error_message"}
+# Beyond this many task results, prompts get counts instead of the full list
+_MAX_PROMPT_TASK_RESULTS = 20
+
+# Outermost JSON object / array in an LLM reply, which may wrap it in prose or code fences
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+def _json_default(value: Any) -> Any:
+    """Serialize models embedded in research data; anything else falls back to str()"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+def _load_json_block(pattern: "re.Pattern[str]", response: str) -> Any:
+    """Parse the JSON block matched by pattern, or None when the reply has none"""
+    match = pattern.search(response)
+    return orjson.loads(match.group()) if match else None
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English and JSON)"""
+    return len(text) // 4
+
+def _summarize_research_data(research_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce research data to each source's scalar scores and flags plus collection sizes"""
+    summary = {}
+    for source, data in research_data.items():
+        if isinstance(data, BaseModel):
+            data = data.model_dump(mode="json")
+        if not isinstance(data, dict):
+            continue
+        source_summary = {}
+        for key, value in data.items():
+            if isinstance(value, (bool, int, float)):
+                source_summary[key] = value
+            elif isinstance(value, (list, dict)):
+                source_summary[f"{key}_count"] = len(value)
+        summary[source] = source_summary
+    return summary
+
+def _to_json(data: Any) -> str:
+    """Render data as compact JSON for prompts; models don't need pretty-printing"""
+    return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+def _compact_research_data(research_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy research data without the bulk no analysis prompt reads (query lists, scraped page text)"""
+    compact = dict(research_data)
+    
+    web_search = research_data.get("web_search")
+    if isinstance(web_search, dict):
+        results = []
+        for result in (web_search.get("search_results") or [])[:_MAX_PROMPT_WEB_RESULTS]:
+            if isinstance(result, BaseModel):
+                result = result.model_dump(mode="json")
+            if isinstance(result, dict):
+                results.append({field: result[field] for field in _WEB_RESULT_FIELDS if result.get(field) is not None})
+        compact["web_search"] = {
+            "search_results": results,
+            "total_results": web_search.get("total_results", len(results))
+        }
+    
+    portfolio = research_data.get("portfolio_research")
+    if isinstance(portfolio, dict):
+        portfolio = dict(portfolio)
+        portfolio_data = portfolio.get("portfolio_data")
+        if isinstance(portfolio_data, dict):
+            # Summaries below already condense the scraped text
+            portfolio["portfolio_data"] = {
+                key: value for key, value in portfolio_data.items() if key not in ("raw_text", "pages")
+            }
+            portfolio["portfolio_data"]["pages"] = [
+                {"url": page.get("url"), "title": page.get("title")}
+                for page in portfolio_data.get("pages", []) if isinstance(page, dict)
+            ]
+        compact["portfolio_research"] = portfolio
+    
+    return compact
+
 class AIAnalysisService(BaseResearchSource):
     """AI-powered analysis service for company research synthesis"""
     
     def __init__(self):
         """Initialize AI analysis service"""
         super().__init__(ResearchSource.AI_ANALYSIS)
-        self.llm_orchestrator = LLMOrchestrator()
+        self.llm_orchestrator = llm_orchestrator
         
         # Analysis prompts
         self.analysis_prompts = {
@@ -33,7 +119,28 @@ class AIAnalysisService(BaseResearchSource):
             "growth_analysis": self._get_growth_analysis_prompt(),
             "employee_insights": self._get_employee_insights_prompt(),
             "risk_assessment": self._get_risk_assessment_prompt(),
-            "recommendations": self._get_recommendations_prompt()
+            "recommendations": self._get_recommendations_prompt(),
+            "key_insights": self._get_key_insights_prompt(),
+            "trust_assessment": self._get_trust_assessment_prompt(),
+            "combined_analysis": self._get_combined_analysis_prompt()
+        }
+        
+        # Per-call data goes after the instructions so the static prefix stays identical across calls
+        self.analysis_inputs = {
+            "executive_summary": "Company: {company_name}\nResearch Data: {research_data}",
+            "authenticity_assessment": "Research Data: {research_data}\nTask Results: {task_results}",
+            "growth_analysis": "Research Data: {research_data}",
+            "employee_insights": "Research Data: {research_data}",
+            "risk_assessment": "Research Data: {research_data}\nAuthenticity Assessment: {authenticity}",
+            "recommendations": "Research Data: {research_data}\nRisk Assessment: {risk_assessment}",
+            "key_insights": "Research Data: {research_data}\nAnalysis Results: {analysis_results}",
+            "trust_assessment": "Research Data: {research_data}\nTask Results: {task_results}",
+            "combined_analysis": "Company: {company_name}\nResearch Data: {research_data}\nTask Results: {task_results}"
+        }
+        # Pre-split into (literal, field) segments so rendering is a join, not a format-string parse
+        self._input_parts = {
+            name: [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+            for name, template in self.analysis_inputs.items()
         }
         
     async def research(self, company_name: str, company_domain: Optional[str] = None, **kwargs) -> Dict[str, Any]:
@@ -45,37 +152,30 @@ class AIAnalysisService(BaseResearchSource):
         if not research_data:
             raise ValueError("No research data provided for AI analysis")
         
+        # Without a provider every section would fall back anyway, so skip straight to that
+        llm_provider = self.llm_orchestrator.get_current_provider()
+        if not llm_provider:
+            return self._all_fallbacks(company_name, research_data)
+        
         # Perform comprehensive AI analysis
         analysis_results = {}
         
         try:
-            # 1. Generate executive summary
-            executive_summary = await self._generate_executive_summary(company_name, research_data)
-            analysis_results['executive_summary'] = executive_summary
-            
-            # 2. Assess company authenticity
-            authenticity = await self._assess_authenticity(research_data, task_results)
-            analysis_results['company_authenticity'] = authenticity
-            
-            # 3. Analyze company growth
-            growth = await self._analyze_growth(research_data)
-            analysis_results['company_growth'] = growth
+            # Serialize shared inputs once, off the event loop; every prompt below embeds the same text
+            research_json, task_results_json = await asyncio.to_thread(
+                self._serialize_inputs, research_data, task_results
+            )
             
-            # 4. Extract employee insights
-            employee_insights = await self._extract_employee_insights(research_data)
-            analysis_results['employee_insights'] = employee_insights
-            
-            # 5. Risk assessment
-            risk_assessment = await self._assess_risks(research_data, authenticity)
-            analysis_results['risk_assessment'] = risk_assessment
-            
-            # 6. Generate recommendations
-            recommendations = await self._generate_recommendations(research_data, risk_assessment)
-            analysis_results['recommendations'] = recommendations
-            
-            # 7. Key insights
-            key_insights = await self._extract_key_insights(research_data, analysis_results)
-            analysis_results['key_insights'] = key_insights
+            # One combined call covers every section; per-section prompts are the fallback
+            combined_results = await self._combined_analysis(
+                llm_provider, company_name, research_data, research_json, task_results_json
+            )
+            if combined_results is not None:
+                analysis_results.update(combined_results)
+            else:
+                await self._sectioned_analysis(
+                    llm_provider, company_name, research_data, research_json, task_results_json, analysis_results
+                )
             
         except Exception as e:
             logger.error(f"AI analysis failed: {str(e)}")
@@ -84,135 +184,308 @@ class AIAnalysisService(BaseResearchSource):
         
         return analysis_results
     
-    async def _generate_executive_summary(self, company_name: str, research_data: Dict[str, Any]) -> str:
+    async def _combined_analysis(
+        self,
+        llm_provider,
+        company_name: str,
+        research_data: Dict[str, Any],
+        research_json: str,
+        task_results_json: str
+    ) -> Optional[Dict[str, Any]]:
+        """Produce every analysis section from a single LLM call, or None if it cannot be used"""
+        prompt = self._render_input(
+            'combined_analysis',
+            company_name=company_name,
+            research_data=research_json,
+            task_results=task_results_json
+        )
+        
+        try:
+            response = await self._generate_text(llm_provider, self.analysis_prompts['combined_analysis'], prompt, max_tokens=1800)
+            data = _load_json_block(_JSON_OBJECT_RE, response)
+            if not isinstance(data, dict):
+                raise ValueError("Combined analysis response is not a JSON object")
+        except Exception as e:
+            logger.warning(f"LLM combined analysis failed, using per-section prompts: {str(e)}")
+            return None
+        
+        # Sections the model skipped or malformed fall back individually
+        analysis_results = {}
+        
+        executive_summary = data.get('executive_summary')
+        analysis_results['executive_summary'] = (
+            executive_summary.strip() if isinstance(executive_summary, str) and executive_summary.strip()
+            else self._fallback_executive_summary(company_name, research_data)
+        )
+        
+        authenticity = data.get('authenticity')
+        analysis_results['company_authenticity'] = (
+            CompanyAuthenticity(**authenticity) if isinstance(authenticity, dict)
+            else self._fallback_authenticity_assessment(research_data)
+        )
+        
+        growth = data.get('growth')
+        analysis_results['company_growth'] = (
+            CompanyGrowth(**growth) if isinstance(growth, dict)
+            else self._fallback_growth_analysis(research_data)
+        )
+        
+        employee_insights = data.get('employee_insights')
+        analysis_results['employee_insights'] = (
+            EmployeeInsights(**employee_insights) if isinstance(employee_insights, dict)
+            else self._fallback_employee_insights(research_data)
+        )
+        
+        risk_assessment = data.get('risk_assessment')
+        analysis_results['risk_assessment'] = (
+            risk_assessment.strip() if isinstance(risk_assessment, str) and risk_assessment.strip()
+            else self._fallback_risk_assessment(research_data, analysis_results['company_authenticity'])
+        )
+        
+        recommendations = data.get('recommendations')
+        analysis_results['recommendations'] = (
+            recommendations if isinstance(recommendations, list) and recommendations
+            else self._fallback_recommendations(research_data, analysis_results['risk_assessment'])
+        )
+        
+        key_insights = data.get('key_insights')
+        analysis_results['key_insights'] = (
+            key_insights if isinstance(key_insights, list) and key_insights
+            else self._fallback_key_insights(research_data, analysis_results)
+        )
+        
+        return analysis_results
+    
+    async def _sectioned_analysis(
+        self,
+        llm_provider,
+        company_name: str,
+        research_data: Dict[str, Any],
+        research_json: str,
+        task_results_json: str,
+        analysis_results: Dict[str, Any]
+    ) -> None:
+        """Run each analysis section as its own prompt, filling analysis_results as sections finish"""
+        # Authenticity, risk and recommendations share one call; the other sections run alongside it
+        executive_summary, trust_assessment, growth, employee_insights = await asyncio.gather(
+            self._generate_executive_summary(llm_provider, company_name, research_data, research_json),
+            self._assess_trust(llm_provider, research_data, research_json, task_results_json),
+            self._analyze_growth(llm_provider, research_data, research_json),
+            self._extract_employee_insights(llm_provider, research_data, research_json),
+            return_exceptions=True
+        )
+        if isinstance(executive_summary, Exception):
+            executive_summary = self._fallback_executive_summary(company_name, research_data)
+        if isinstance(trust_assessment, Exception):
+            authenticity = self._fallback_authenticity_assessment(research_data)
+            risk_assessment = self._fallback_risk_assessment(research_data, authenticity)
+            trust_assessment = (authenticity, risk_assessment, self._fallback_recommendations(research_data, risk_assessment))
+        authenticity, risk_assessment, recommendations = trust_assessment
+        if isinstance(growth, Exception):
+            growth = self._fallback_growth_analysis(research_data)
+        if isinstance(employee_insights, Exception):
+            employee_insights = self._fallback_employee_insights(research_data)
+        
+        analysis_results['executive_summary'] = executive_summary
+        analysis_results['company_authenticity'] = authenticity
+        analysis_results['company_growth'] = growth
+        analysis_results['employee_insights'] = employee_insights
+        analysis_results['risk_assessment'] = risk_assessment
+        analysis_results['recommendations'] = recommendations
+        
+        # Key insights draw on everything above
+        try:
+            key_insights = await self._extract_key_insights(llm_provider, research_data, research_json, dict(analysis_results))
+        except Exception:
+            key_insights = self._fallback_key_insights(research_data, analysis_results)
+        analysis_results['key_insights'] = key_insights
+    
+    async def _assess_trust(
+        self,
+        llm_provider,
+        research_data: Dict[str, Any],
+        research_json: str,
+        task_results_json: str
+    ) -> Tuple[CompanyAuthenticity, str, List[str]]:
+        """Assess authenticity, risks and recommendations in one call, chaining per-section prompts if that fails"""
+        prompt = self._render_input(
+            'trust_assessment',
+            research_data=research_json,
+            task_results=task_results_json
+        )
+        
+        data = None
+        try:
+            response = await self._generate_text(llm_provider, self.analysis_prompts['trust_assessment'], prompt, max_tokens=900)
+            data = _load_json_block(_JSON_OBJECT_RE, response)
+        except Exception as e:
+            logger.warning(f"LLM trust assessment failed, using per-section prompts: {str(e)}")
+        
+        if not isinstance(data, dict):
+            authenticity = await self._assess_authenticity(llm_provider, research_data, research_json, task_results_json)
+            risk_assessment = await self._assess_risks(llm_provider, research_data, research_json, authenticity)
+            recommendations = await self._generate_recommendations(llm_provider, research_data, research_json, risk_assessment)
+            return authenticity, risk_assessment, recommendations
+        
+        authenticity = data.get('authenticity')
+        if not isinstance(authenticity, dict):
+            authenticity = self._fallback_authenticity_assessment(research_data)
+        risk_assessment = data.get('risk_assessment')
+        if not (isinstance(risk_assessment, str) and risk_assessment.strip()):
+            risk_assessment = self._fallback_risk_assessment(research_data, authenticity)
+        recommendations = data.get('recommendations')
+        if not (isinstance(recommendations, list) and recommendations):
+            recommendations = self._fallback_recommendations(research_data, risk_assessment)
+        return CompanyAuthenticity(**authenticity), risk_assessment.strip(), recommendations
+    
+    @staticmethod
+    def _serialize_inputs(research_data: Dict[str, Any], task_results: List[ResearchTaskResult]) -> Tuple[str, str]:
+        """Render the research data and task results embedded in every analysis prompt"""
+        research_json = _to_json(_compact_research_data(research_data))
+        # Task data already appears in research_data, so only outcome fields are sent
+        if not task_results:
+            task_results_json = "[]"
+        elif len(task_results) > _MAX_PROMPT_TASK_RESULTS:
+            task_results_json = _to_json({
+                "num_tasks": len(task_results),
+                "failed": sum(1 for tr in task_results if tr.status == ResearchStatus.FAILED),
+                "sources": [tr.source for tr in task_results]
+            })
+        else:
+            task_results_json = _to_json([tr.model_dump(mode="json", include=_TASK_RESULT_FIELDS) for tr in task_results])
+        return research_json, task_results_json
+    
+    def _render_input(self, name: str, **values: str) -> str:
+        """Fill a pre-split analysis input template"""
+        parts = []
+        for literal, field in self._input_parts[name]:
+            parts.append(literal)
+            if field is not None:
+                parts.append(values[field])
+        return "".join(parts)
+    
+    async def _generate_text(self, llm_provider, instructions: str, prompt: str, max_tokens: int) -> str:
+        """Run static instructions plus per-call data through the provider, raising when it reports a failure"""
+        # An oversized prompt would fail (or be truncated) only after a long prefill
+        if _estimate_tokens(instructions) + _estimate_tokens(prompt) > settings.AI_ANALYSIS_MAX_INPUT_TOKENS:
+            raise ValueError("Prompt exceeds the AI analysis input token budget")
+        async with self.llm_orchestrator.get_provider_semaphore(llm_provider):
+            response = await llm_provider.generate_response(prompt, max_tokens=max_tokens, instructions=instructions)
+        if not response.get("success", True):
+            raise RuntimeError(response.get("error") or "LLM generation failed")
+        return response.get("content") or ""
+    
+    async def _generate_executive_summary(self, llm_provider, company_name: str, research_data: Dict[str, Any], research_json: str) -> str:
         """Generate executive summary of company research"""
-        prompt = self.analysis_prompts['executive_summary'].format(
+        prompt = self._render_input(
+            'executive_summary',
             company_name=company_name,
-            research_data=json.dumps(research_data, indent=2)
+            research_data=research_json
         )
         
         try:
-            llm_provider = self.llm_orchestrator.get_current_provider()
-            if llm_provider:
-                response = await llm_provider.generate_text(prompt, max_tokens=500)
-                return response.strip()
-            else:
-                return self._fallback_executive_summary(company_name, research_data)
+            response = await self._generate_text(llm_provider, self.analysis_prompts['executive_summary'], prompt, max_tokens=500)
+            return response.strip()
         except Exception as e:
             logger.warning(f"LLM executive summary generation failed: {str(e)}")
             return self._fallback_executive_summary(company_name, research_data)
     
-    async def _assess_authenticity(self, research_data: Dict[str, Any], task_results: List[ResearchTaskResult]) -> CompanyAuthenticity:
+    async def _assess_authenticity(self, llm_provider, research_data: Dict[str, Any], research_json: str, task_results_json: str) -> CompanyAuthenticity:
         """Assess company authenticity based on research data"""
-        prompt = self.analysis_prompts['authenticity_assessment'].format(
-            research_data=json.dumps(research_data, indent=2),
-            task_results=json.dumps([tr.dict() for tr in task_results], indent=2)
+        prompt = self._render_input(
+            'authenticity_assessment',
+            research_data=research_json,
+            task_results=task_results_json
         )
         
         try:
-            llm_provider = self.llm_orchestrator.get_current_provider()
-            if llm_provider:
-                response = await llm_provider.generate_text(prompt, max_tokens=300)
-                return self._parse_authenticity_response(response)
-            else:
-                return self._fallback_authenticity_assessment(research_data)
+            response = await self._generate_text(llm_provider, self.analysis_prompts['authenticity_assessment'], prompt, max_tokens=300)
+            return self._parse_authenticity_response(response)
         except Exception as e:
             logger.warning(f"LLM authenticity assessment failed: {str(e)}")
             return self._fallback_authenticity_assessment(research_data)
     
-    async def _analyze_growth(self, research_data: Dict[str, Any]) -> CompanyGrowth:
+    async def _analyze_growth(self, llm_provider, research_data: Dict[str, Any], research_json: str) -> CompanyGrowth:
         """Analyze company growth indicators"""
-        prompt = self.analysis_prompts['growth_analysis'].format(
-            research_data=json.dumps(research_data, indent=2)
+        prompt = self._render_input(
+            'growth_analysis',
+            research_data=research_json
         )
         
         try:
-            llm_provider = self.llm_orchestrator.get_current_provider()
-            if llm_provider:
-                response = await llm_provider.generate_text(prompt, max_tokens=300)
-                return self._parse_growth_response(response)
-            else:
-                return self._fallback_growth_analysis(research_data)
+            response = await self._generate_text(llm_provider, self.analysis_prompts['growth_analysis'], prompt, max_tokens=300)
+            return self._parse_growth_response(response)
         except Exception as e:
             logger.warning(f"LLM growth analysis failed: {str(e)}")
             return self._fallback_growth_analysis(research_data)
     
-    async def _extract_employee_insights(self, research_data: Dict[str, Any]) -> EmployeeInsights:
+    async def _extract_employee_insights(self, llm_provider, research_data: Dict[str, Any], research_json: str) -> EmployeeInsights:
         """Extract employee-related insights"""
-        prompt = self.analysis_prompts['employee_insights'].format(
-            research_data=json.dumps(research_data, indent=2)
+        prompt = self._render_input(
+            'employee_insights',
+            research_data=research_json
         )
         
         try:
-            llm_provider = self.llm_orchestrator.get_current_provider()
-            if llm_provider:
-                response = await llm_provider.generate_text(prompt, max_tokens=300)
-                return self._parse_employee_insights_response(response)
-            else:
-                return self._fallback_employee_insights(research_data)
+            response = await self._generate_text(llm_provider, self.analysis_prompts['employee_insights'], prompt, max_tokens=300)
+            return self._parse_employee_insights_response(response)
         except Exception as e:
             logger.warning(f"LLM employee insights failed: {str(e)}")
             return self._fallback_employee_insights(research_data)
     
-    async def _assess_risks(self, research_data: Dict[str, Any], authenticity: CompanyAuthenticity) -> str:
+    async def _assess_risks(self, llm_provider, research_data: Dict[str, Any], research_json: str, authenticity: CompanyAuthenticity) -> str:
         """Assess potential risks associated with the company"""
-        prompt = self.analysis_prompts['risk_assessment'].format(
-            research_data=json.dumps(research_data, indent=2),
-            authenticity=json.dumps(authenticity.dict(), indent=2)
+        prompt = self._render_input(
+            'risk_assessment',
+            research_data=research_json,
+            authenticity=_to_json(authenticity)
         )
         
         try:
-            llm_provider = self.llm_orchestrator.get_current_provider()
-            if llm_provider:
-                response = await llm_provider.generate_text(prompt, max_tokens=200)
-                return response.strip()
-            else:
-                return self._fallback_risk_assessment(research_data, authenticity)
+            response = await self._generate_text(llm_provider, self.analysis_prompts['risk_assessment'], prompt, max_tokens=200)
+            return response.strip()
         except Exception as e:
             logger.warning(f"LLM risk assessment failed: {str(e)}")
             return self._fallback_risk_assessment(research_data, authenticity)
     
-    async def _generate_recommendations(self, research_data: Dict[str, Any], risk_assessment: str) -> List[str]:
+    async def _generate_recommendations(self, llm_provider, research_data: Dict[str, Any], research_json: str, risk_assessment: str) -> List[str]:
         """Generate actionable recommendations"""
-        prompt = self.analysis_prompts['recommendations'].format(
-            research_data=json.dumps(research_data, indent=2),
+        prompt = self._render_input(
+            'recommendations',
+            research_data=research_json,
             risk_assessment=risk_assessment
         )
         
         try:
-            llm_provider = self.llm_orchestrator.get_current_provider()
-            if llm_provider:
-                response = await llm_provider.generate_text(prompt, max_tokens=300)
-                return self._parse_recommendations_response(response)
-            else:
-                return self._fallback_recommendations(research_data, risk_assessment)
+            response = await self._generate_text(llm_provider, self.analysis_prompts['recommendations'], prompt, max_tokens=300)
+            return self._parse_recommendations_response(response)
         except Exception as e:
             logger.warning(f"LLM recommendations failed: {str(e)}")
             return self._fallback_recommendations(research_data, risk_assessment)
     
-    async def _extract_key_insights(self, research_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> List[str]:
+    async def _extract_key_insights(self, llm_provider, research_data: Dict[str, Any], research_json: str, analysis_results: Dict[str, Any]) -> List[str]:
         """Extract key insights from research and analysis"""
-        # Combine research data and analysis results
-        combined_data = {
-            "research_data": research_data,
-            "analysis_results": analysis_results
-        }
-        
-        prompt = f"""
-        Based on the following company research data and analysis, extract 5-7 key insights that would be most valuable for someone considering working at or doing business with this company.
-        
-        Data: {json.dumps(combined_data, indent=2)}
+        analysis_json = _to_json(analysis_results)
+        prompt = self._render_input(
+            'key_insights',
+            research_data=research_json,
+            analysis_results=analysis_json
+        )
         
-        Provide insights as a JSON array of strings, each insight should be concise but informative.
-        """
+        budget = settings.AI_ANALYSIS_MAX_INPUT_TOKENS - _estimate_tokens(self.analysis_prompts['key_insights'])
+        if _estimate_tokens(prompt) > budget:
+            # Keep the analysis but reduce research data to counts and scores
+            prompt = self._render_input(
+                'key_insights',
+                research_data=_to_json(_summarize_research_data(research_data)),
+                analysis_results=analysis_json
+            )
+            if _estimate_tokens(prompt) > budget:
+                return self._fallback_key_insights(research_data, analysis_results)
         
         try:
-            llm_provider = self.llm_orchestrator.get_current_provider()
-            if llm_provider:
-                response = await llm_provider.generate_text(prompt, max_tokens=400)
-                return self._parse_insights_response(response)
-            else:
-                return self._fallback_key_insights(research_data, analysis_results)
+            response = await self._generate_text(llm_provider, self.analysis_prompts['key_insights'], prompt, max_tokens=400)
+            return self._parse_insights_response(response)
         except Exception as e:
             logger.warning(f"LLM key insights failed: {str(e)}")
             return self._fallback_key_insights(research_data, analysis_results)
@@ -225,10 +498,7 @@ class AIAnalysisService(BaseResearchSource):
         2. Key strengths and market position
         3. Notable achievements or challenges
         
-        Company: {company_name}
-        Research Data: {research_data}
-        
-        Executive Summary:
+        Respond with the executive summary only.
         """
     
     def _get_authenticity_assessment_prompt(self) -> str:
@@ -246,11 +516,6 @@ class AIAnalysisService(BaseResearchSource):
         - risk_factors: array of strings
         - trust_indicators: array of strings
         - overall_assessment: "trustworthy", "suspicious", or "unknown"
-        
-        Research Data: {research_data}
-        Task Results: {task_results}
-        
-        Assessment:
         """
     
     def _get_growth_analysis_prompt(self) -> str:
@@ -264,10 +529,6 @@ class AIAnalysisService(BaseResearchSource):
         - expansion_news: array of strings
         - market_position: string
         - growth_score: float (0-1)
-        
-        Research Data: {research_data}
-        
-        Analysis:
         """
     
     def _get_employee_insights_prompt(self) -> str:
@@ -284,21 +545,12 @@ class AIAnalysisService(BaseResearchSource):
         - management_score: float (0-1)
         - overall_rating: float (0-5)
         - review_count: number
-        
-        Research Data: {research_data}
-        
-        Insights:
         """
     
     def _get_risk_assessment_prompt(self) -> str:
         return """
         Based on the company research data and authenticity assessment, provide a concise risk assessment.
         Focus on potential red flags, concerns, or areas that require further investigation.
-        
-        Research Data: {research_data}
-        Authenticity Assessment: {authenticity}
-        
-        Risk Assessment:
         """
     
     def _get_recommendations_prompt(self) -> str:
@@ -306,26 +558,62 @@ class AIAnalysisService(BaseResearchSource):
         Based on the company research data and risk assessment, provide 3-5 actionable recommendations.
         These should be practical suggestions for someone considering working at or doing business with this company.
         
-        Research Data: {research_data}
-        Risk Assessment: {risk_assessment}
-        
         Provide recommendations as a JSON array of strings.
+        """
+    
+    def _get_key_insights_prompt(self) -> str:
+        return """
+        Based on the following company research data and analysis, extract 5-7 key insights that would be most valuable for someone considering working at or doing business with this company.
         
-        Recommendations:
+        Provide insights as a JSON array of strings, each insight should be concise but informative.
+        """
+    
+    def _get_trust_assessment_prompt(self) -> str:
+        return """
+        Analyze the following company research data for someone considering working at or doing business with this company.
+        Consider domain age, web presence, news coverage, and overall credibility.
+        
+        Respond with a single JSON object with exactly these fields:
+        - authenticity: object with
+            domain_age_days: number, domain_reputation_score: float (0-1), social_presence_score: float (0-1),
+            news_mentions_count: number, employee_reviews_count: number, authenticity_score: float (0-1),
+            risk_factors: array of strings, trust_indicators: array of strings,
+            overall_assessment: "trustworthy", "suspicious", or "unknown"
+        - risk_assessment: string, a concise assessment of red flags, concerns, or areas that require further investigation, informed by the authenticity assessment
+        - recommendations: array of 3-5 practical, actionable recommendation strings informed by the risk assessment
+        """
+    
+    def _get_combined_analysis_prompt(self) -> str:
+        return """
+        Analyze the following company research data for someone considering working at or doing business with this company.
+        
+        Respond with a single JSON object with exactly these fields:
+        - executive_summary: string, a concise 2-3 paragraph summary covering the company overview and main business, key strengths and market position, and notable achievements or challenges
+        - authenticity: object with
+            domain_age_days: number, domain_reputation_score: float (0-1), social_presence_score: float (0-1),
+            news_mentions_count: number, employee_reviews_count: number, authenticity_score: float (0-1),
+            risk_factors: array of strings, trust_indicators: array of strings,
+            overall_assessment: "trustworthy", "suspicious", or "unknown"
+        - growth: object with
+            employee_growth_trend: string, funding_rounds: array of objects, acquisition_history: array of objects,
+            expansion_news: array of strings, market_position: string, growth_score: float (0-1)
+        - employee_insights: object with
+            review_sentiment: string, common_pros: array of strings, common_cons: array of strings,
+            work_life_balance_score: float (0-1), career_growth_score: float (0-1), compensation_score: float (0-1),
+            management_score: float (0-1), overall_rating: float (0-5), review_count: number
+        - risk_assessment: string, a concise assessment of red flags, concerns, or areas that require further investigation, informed by the authenticity assessment
+        - recommendations: array of 3-5 practical, actionable recommendation strings informed by the risk assessment
+        - key_insights: array of 5-7 concise but informative insight strings
         """
     
     # Response parsing methods
     def _parse_authenticity_response(self, response: str) -> CompanyAuthenticity:
         """Parse LLM response for authenticity assessment"""
         try:
-            # Try to extract JSON from response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start != -1 and json_end != 0:
-                json_str = response[json_start:json_end]
-                data = json.loads(json_str)
+            data = _load_json_block(_JSON_OBJECT_RE, response)
+            if isinstance(data, dict):
                 return CompanyAuthenticity(**data)
-        except:
+        except ValueError:
             pass
         
         # Fallback to default values
@@ -338,13 +626,10 @@ class AIAnalysisService(BaseResearchSource):
     def _parse_growth_response(self, response: str) -> CompanyGrowth:
         """Parse LLM response for growth analysis"""
         try:
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start != -1 and json_end != 0:
-                json_str = response[json_start:json_end]
-                data = json.loads(json_str)
+            data = _load_json_block(_JSON_OBJECT_RE, response)
+            if isinstance(data, dict):
                 return CompanyGrowth(**data)
-        except:
+        except ValueError:
             pass
         
         return CompanyGrowth()
@@ -352,13 +637,10 @@ class AIAnalysisService(BaseResearchSource):
     def _parse_employee_insights_response(self, response: str) -> EmployeeInsights:
         """Parse LLM response for employee insights"""
         try:
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start != -1 and json_end != 0:
-                json_str = response[json_start:json_end]
-                data = json.loads(json_str)
+            data = _load_json_block(_JSON_OBJECT_RE, response)
+            if isinstance(data, dict):
                 return EmployeeInsights(**data)
-        except:
+        except ValueError:
             pass
         
         return EmployeeInsights()
@@ -366,12 +648,10 @@ class AIAnalysisService(BaseResearchSource):
     def _parse_recommendations_response(self, response: str) -> List[str]:
         """Parse LLM response for recommendations"""
         try:
-            json_start = response.find('[')
-            json_end = response.rfind(']') + 1
-            if json_start != -1 and json_end != 0:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
-        except:
+            data = _load_json_block(_JSON_ARRAY_RE, response)
+            if isinstance(data, list):
+                return data
+        except ValueError:
             pass
         
         return ["Conduct additional research", "Verify information independently"]
@@ -379,17 +659,30 @@ class AIAnalysisService(BaseResearchSource):
     def _parse_insights_response(self, response: str) -> List[str]:
         """Parse LLM response for key insights"""
         try:
-            json_start = response.find('[')
-            json_end = response.rfind(']') + 1
-            if json_start != -1 and json_end != 0:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
-        except:
+            data = _load_json_block(_JSON_ARRAY_RE, response)
+            if isinstance(data, list):
+                return data
+        except ValueError:
             pass
         
         return ["Analysis completed with AI assistance", "Key insights available in detailed results"]
     
     # Fallback methods
+    def _all_fallbacks(self, company_name: str, research_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build every analysis section from fallbacks, in the same shape as an LLM-backed analysis"""
+        authenticity = self._fallback_authenticity_assessment(research_data)
+        risk_assessment = self._fallback_risk_assessment(research_data, authenticity)
+        analysis_results = {
+            'executive_summary': self._fallback_executive_summary(company_name, research_data),
+            'company_authenticity': authenticity,
+            'company_growth': self._fallback_growth_analysis(research_data),
+            'employee_insights': self._fallback_employee_insights(research_data),
+            'risk_assessment': risk_assessment,
+            'recommendations': self._fallback_recommendations(research_data, risk_assessment)
+        }
+        analysis_results['key_insights'] = self._fallback_key_insights(research_data, analysis_results)
+        return analysis_results
+    
     def _fallback_executive_summary(self, company_name: str, research_data: Dict[str, Any]) -> str:
         """Fallback executive summary when LLM fails"""
         return f"Company research completed for {company_name}. Analysis includes domain verification, web search results, and entity information. Review the detailed results for comprehensive insights."
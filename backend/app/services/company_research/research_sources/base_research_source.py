@@ -3,11 +3,15 @@ Base Research Source Interface
 Defines the contract that all research sources must implement
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from app.models.schemas.company_research import ResearchSource, ResearchStatus, ResearchTaskResult
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from app.models.schemas.company_research import ResearchSource, ResearchStatus, ResearchTaskResult, build_trusted
+from app.config.settings import settings
+import asyncio
 import logging
+import random
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +23,16 @@ class BaseResearchSource(ABC):
         self.source_name = source_name
         self.api_key = api_key
         self.is_available = True
-        self.last_used = None
+        self.last_used: Optional[float] = None  # epoch seconds of the last successful lookup
         self.error_count = 0
         self.max_retries = 3
         self.retry_delay = 1  # seconds
+        self.max_backoff = 30  # seconds
+        
+        # (company_name, company_domain) -> running lookup shared by concurrent callers
+        self._inflight: Dict[Tuple[str, Optional[str]], "asyncio.Task[ResearchTaskResult]"] = {}
+        # (company_name, company_domain) -> (expires_at, result) for recent successful lookups
+        self._result_cache: "OrderedDict[Tuple[str, Optional[str]], Tuple[float, ResearchTaskResult]]" = OrderedDict()
         
     @abstractmethod
     async def research(self, company_name: str, company_domain: Optional[str] = None, **kwargs) -> Dict[str, Any]:
@@ -39,18 +49,59 @@ class BaseResearchSource(ABC):
         """Check if the service is healthy and available"""
         pass
     
+    def _is_cacheable(self, data: Dict[str, Any]) -> bool:
+        """Whether a completed result is genuine enough to share; sources that mask outages override this"""
+        return True
+    
     async def execute_research(self, company_name: str, company_domain: Optional[str] = None, **kwargs) -> ResearchTaskResult:
+        """Execute research, sharing in-flight and recent lookups for the same company"""
+        # Calls with extra inputs (e.g. AI analysis over aggregated data) are not interchangeable
+        if kwargs or settings.RESEARCH_SOURCE_CACHE_MAX_SIZE <= 0:
+            return await self._execute_research(company_name, company_domain, **kwargs)
+        
+        key = (company_name, company_domain)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            if time.monotonic() < cached[0]:
+                self._result_cache.move_to_end(key)
+                return cached[1]
+            self._result_cache.pop(key, None)
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._execute_research(company_name, company_domain))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish_lookup(key, done))
+        # Shielded so one caller being cancelled doesn't cancel the lookup for the others
+        return await asyncio.shield(task)
+    
+    def _finish_lookup(self, key: Tuple[str, Optional[str]], task: "asyncio.Task[ResearchTaskResult]") -> None:
+        """Release a finished shared lookup and cache it if it succeeded"""
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        
+        result = task.result()
+        if result.status != ResearchStatus.COMPLETED or not self._is_cacheable(result.data or {}):
+            return
+        self._result_cache[key] = (time.monotonic() + settings.RESEARCH_SOURCE_CACHE_TTL_SECONDS, result)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > settings.RESEARCH_SOURCE_CACHE_MAX_SIZE:
+            self._result_cache.popitem(last=False)
+    
+    async def _execute_research(self, company_name: str, company_domain: Optional[str] = None, **kwargs) -> ResearchTaskResult:
         """Execute research with error handling and retries"""
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             # Check if service is healthy
             if not self.is_healthy():
-                return ResearchTaskResult(
+                return build_trusted(
+                    ResearchTaskResult,
                     source=self.source_name,
                     status=ResearchStatus.FAILED,
                     error_message="Service is not healthy",
-                    processing_time=time.time() - start_time,
+                    processing_time=time.monotonic() - start_time,
                     cost_estimate=self.get_cost_estimate()
                 )
             
@@ -60,14 +111,15 @@ class BaseResearchSource(ABC):
                     data = await self.research(company_name, company_domain, **kwargs)
                     
                     # Success - update metrics
-                    self.last_used = datetime.utcnow()
+                    self.last_used = time.time()
                     self.error_count = 0
                     
-                    return ResearchTaskResult(
+                    return build_trusted(
+                        ResearchTaskResult,
                         source=self.source_name,
                         status=ResearchStatus.COMPLETED,
                         data=data,
-                        processing_time=time.time() - start_time,
+                        processing_time=time.monotonic() - start_time,
                         cost_estimate=self.get_cost_estimate()
                     )
                     
@@ -76,35 +128,41 @@ class BaseResearchSource(ABC):
                     logger.warning(f"Attempt {attempt + 1} failed for {self.source_name}: {str(e)}")
                     
                     if attempt < self.max_retries - 1:
-                        await asyncio.sleep(self.retry_delay * (2 ** attempt))  # Exponential backoff
+                        await asyncio.sleep(self._retry_backoff(attempt))
                     else:
                         # All retries exhausted
                         logger.error(f"All retries failed for {self.source_name}: {str(e)}")
-                        return ResearchTaskResult(
+                        return build_trusted(
+                            ResearchTaskResult,
                             source=self.source_name,
                             status=ResearchStatus.FAILED,
                             error_message=str(e),
-                            processing_time=time.time() - start_time,
+                            processing_time=time.monotonic() - start_time,
                             cost_estimate=self.get_cost_estimate()
                         )
                         
         except Exception as e:
             logger.error(f"Unexpected error in {self.source_name}: {str(e)}")
-            return ResearchTaskResult(
+            return build_trusted(
+                ResearchTaskResult,
                 source=self.source_name,
                 status=ResearchStatus.FAILED,
                 error_message=f"Unexpected error: {str(e)}",
-                processing_time=time.time() - start_time,
+                processing_time=time.monotonic() - start_time,
                 cost_estimate=self.get_cost_estimate()
             )
     
+    def _retry_backoff(self, attempt: int) -> float:
+        """Jittered exponential backoff, capped so failing sources don't retry in lockstep"""
+        return min(self.max_backoff, random.uniform(self.retry_delay, self.retry_delay * 3 * (2 ** attempt)))
+    
     def get_health_status(self) -> Dict[str, Any]:
         """Get detailed health status of the service"""
         return {
             "source": self.source_name,
             "is_available": self.is_available,
             "is_healthy": self.is_healthy(),
-            "last_used": self.last_used,
+            "last_used": datetime.fromtimestamp(self.last_used, tz=timezone.utc) if self.last_used is not None else None,
             "error_count": self.error_count,
             "api_key_configured": bool(self.api_key)
         }
@@ -121,7 +179,3 @@ class BaseResearchSource(ABC):
             logger.warning(f"Service {self.source_name} marked as unavailable")
         else:
             logger.info(f"Service {self.source_name} marked as available")
-
-# Import asyncio for the sleep function
-import asyncio
-
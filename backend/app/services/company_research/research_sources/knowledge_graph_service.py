@@ -3,22 +3,52 @@ Google Knowledge Graph Service for Company Research
 Provides company entity information from Google's Knowledge Graph
 """
 import asyncio
-import aiohttp
+import httpx
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
-import json
 import re
+import orjson
 
 from .base_research_source import BaseResearchSource
 from app.models.schemas.company_research import ResearchSource, KnowledgeGraphData
 from app.config.settings import settings
+from app.core.http_client import SharedHTTPClient
+from app.core.redis_cache import redis_cache
 
 logger = logging.getLogger(__name__)
 
+# Optional scheme, optional www. prefix and optional trailing slash around the bare domain
+_DOMAIN_RE = re.compile(r'^(?:https?://)?(?:www\.)?(.+?)/?$', re.IGNORECASE)
+
+# Shared HTTP client for all Knowledge Graph lookups
+_http_client = SharedHTTPClient(timeout=30.0)
+
 class KnowledgeGraphService(BaseResearchSource):
     """Google Knowledge Graph service for company entity lookup"""
     
+    # Entity properties checked in order by the field extractors
+    _INDUSTRY_FIELDS = ("industry", "sector", "businessCategory")
+    _FOUNDED_DATE_FIELDS = ("foundingDate", "dateFounded", "established")
+    _HEADQUARTERS_FIELDS = ("headquarters", "addressLocality", "addressCountry")
+    _CEO_FIELDS = ("ceo", "founder", "executive")
+    _EMPLOYEE_FIELDS = ("numberOfEmployees", "employeeCount", "staffCount")
+    _REVENUE_FIELDS = ("revenue", "annualRevenue", "turnover")
+    _WEBSITE_FIELDS = ("url", "website", "homepage")
+    _SOCIAL_PLATFORMS = ("facebook", "twitter", "linkedin", "instagram", "youtube")
+    
+    SHARED_CACHE_PREFIX = "knowledge_graph:search"
+    
+    # Consecutive API failures that open the circuit, and how long it stays open
+    CIRCUIT_FAILURE_THRESHOLD = 5
+    CIRCUIT_COOLDOWN_SECONDS = 30
+    # Longest Retry-After we are willing to wait out on a 429
+    MAX_RETRY_AFTER_SECONDS = 10
+    # Concurrent API searches allowed per research_many batch
+    BATCH_CONCURRENCY = 10
+    
     def __init__(self):
         """Initialize Knowledge Graph service"""
         super().__init__(ResearchSource.KNOWLEDGE_GRAPH)
@@ -34,77 +64,221 @@ class KnowledgeGraphService(BaseResearchSource):
             "TechnologyCompany",
             "SoftwareCompany"
         ]
+        # Matches any company type as a substring of an entity's @type
+        self._company_type_re = re.compile("|".join(map(re.escape, self.company_types)))
+        
+        # query -> shared in-flight search, so concurrent misses hit the API once
+        self._search_inflight: Dict[str, "asyncio.Task[Optional[List[Dict[str, Any]]]]"] = {}
+        # query -> (expires_at, entities), least recently used first
+        self._search_cache: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        
+        # Circuit breaker state: skip API calls until _circuit_open_until after repeated failures
+        self._failure_count = 0
+        self._circuit_open_until = 0.0
         
     async def research(self, company_name: str, company_domain: Optional[str] = None, **kwargs) -> Dict[str, Any]:
         """Search for company information in Google Knowledge Graph"""
         if not self.api_key:
             raise ValueError("Google Knowledge Graph API key not configured")
         
-        # Try different search strategies
-        search_results = []
+        queries = self._build_queries(company_name, company_domain)
+        entities_by_query = await self._search_all(queries, force_refresh=kwargs.get("force_refresh", False))
+        result = self._select_entity(company_name, queries, entities_by_query)
+        # No query got an answer (API errors or open circuit): fail rather than report "no entity"
+        if result is None:
+            raise RuntimeError("Knowledge Graph API did not answer any search")
+        return result
+    
+    async def research_many(
+        self,
+        companies: List[Tuple[str, Optional[str]]],
+        force_refresh: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up several companies at once, issuing each distinct query only once
         
-        # Strategy 1: Direct company name search
-        try:
-            result = await self._search_entity(company_name)
-            if result:
-                search_results.extend(result)
-        except Exception as e:
-            logger.warning(f"Direct company search failed: {str(e)}")
+        A company whose searches all went unanswered (API errors or open circuit) gets None,
+        so outages stay distinguishable from the "no entity found" result.
+        """
+        if not self.api_key:
+            raise ValueError("Google Knowledge Graph API key not configured")
         
-        # Strategy 2: Search with company type
-        try:
-            for entity_type in self.company_types:
-                result = await self._search_entity(f"{company_name} {entity_type}")
-                if result:
-                    search_results.extend(result)
-                    break  # Stop after first successful type search
-        except Exception as e:
-            logger.warning(f"Typed company search failed: {str(e)}")
+        queries_per_company = [self._build_queries(name, domain) for name, domain in companies]
+        all_queries = list(dict.fromkeys(query for queries in queries_per_company for query in queries))
+        entities_by_query = await self._search_all(
+            all_queries,
+            force_refresh=force_refresh,
+            semaphore=asyncio.Semaphore(self.BATCH_CONCURRENCY)
+        )
         
-        # Strategy 3: Domain-based search if available
+        return [
+            self._select_entity(name, queries, entities_by_query)
+            for (name, _), queries in zip(companies, queries_per_company)
+        ]
+    
+    def _build_queries(self, company_name: str, company_domain: Optional[str]) -> List[str]:
+        """Build the search strategies for a company: direct name, then the bare domain if known"""
+        # Results are already restricted to Organization, which covers every company type
+        queries = [company_name]
         if company_domain:
-            try:
-                clean_domain = self._clean_domain(company_domain)
-                result = await self._search_entity(clean_domain)
-                if result:
-                    search_results.extend(result)
-            except Exception as e:
-                logger.warning(f"Domain-based search failed: {str(e)}")
+            queries.append(self._clean_domain(company_domain))
+        # Drop repeated queries (e.g. a name that equals its domain) while keeping order
+        return list(dict.fromkeys(queries))
+    
+    async def _search_all(
+        self,
+        queries: List[str],
+        force_refresh: bool = False,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Run searches concurrently, optionally bounded, mapping each answered query to its entities"""
+        async def search(query: str) -> Optional[List[Dict[str, Any]]]:
+            if semaphore is None:
+                return await self._search_entity(query, force_refresh=force_refresh)
+            async with semaphore:
+                return await self._search_entity(query, force_refresh=force_refresh)
         
-        # Process and rank results
-        if search_results:
-            # Remove duplicates
-            unique_results = self._deduplicate_results(search_results)
-            # Rank by relevance
-            ranked_results = self._rank_results(unique_results, company_name)
-            # Take the best result
-            best_result = ranked_results[0] if ranked_results else None
-            
-            if best_result:
-                return self._parse_entity_data(best_result)
+        results = await asyncio.gather(*(search(query) for query in queries), return_exceptions=True)
+        
+        entities_by_query = {}
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Knowledge Graph search for '{query}' failed: {str(result)}")
+            elif result is not None:
+                entities_by_query[query] = result
+        return entities_by_query
+    
+    def _select_entity(
+        self,
+        company_name: str,
+        queries: List[str],
+        entities_by_query: Dict[str, List[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Parse the most relevant entity found by a company's queries; None if none of them was answered"""
+        if not any(query in entities_by_query for query in queries):
+            return None
+        
+        search_results = [entity for query in queries for entity in entities_by_query.get(query, ())]
+        
+        # Pick the most relevant entity; duplicates across strategies can't change the winner
+        best_result = self._best_result(search_results, company_name)
+        if best_result:
+            return self._parse_entity_data(best_result)
         
         # Return empty result if no matches found
         return self._create_empty_result(company_name)
     
-    async def _search_entity(self, query: str) -> List[Dict[str, Any]]:
-        """Search for entities in Knowledge Graph"""
+    async def _search_entity(self, query: str, force_refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Search for entities in Knowledge Graph, sharing cached and in-flight results per query; None if the API didn't answer"""
+        # Case and spacing don't change Knowledge Graph results, so they don't split the cache
+        key = " ".join(query.lower().split())
+        if settings.KNOWLEDGE_GRAPH_CACHE_MAX_SIZE <= 0:
+            return await self._lookup_entities(query, key, force_refresh)
+        
+        if not force_refresh:
+            cached = self._search_cache.get(key)
+            if cached is not None:
+                if time.monotonic() < cached[0]:
+                    self._search_cache.move_to_end(key)
+                    return cached[1]
+                self._search_cache.pop(key, None)
+        
+        task = self._search_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._lookup_entities(query, key, force_refresh))
+            self._search_inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish_search_lookup(key, done))
+        # Shielded so one caller being cancelled doesn't cancel the search for the others
+        return await asyncio.shield(task)
+    
+    def _finish_search_lookup(self, key: str, task: "asyncio.Task[Optional[List[Dict[str, Any]]]]") -> None:
+        """Release a finished shared search and cache it if the API answered"""
+        self._search_inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        
+        entities = task.result()
+        if entities is None:
+            return
+        self._search_cache[key] = (time.monotonic() + settings.KNOWLEDGE_GRAPH_CACHE_TTL_SECONDS, entities)
+        self._search_cache.move_to_end(key)
+        while len(self._search_cache) > settings.KNOWLEDGE_GRAPH_CACHE_MAX_SIZE:
+            self._search_cache.popitem(last=False)
+    
+    async def _lookup_entities(self, query: str, key: str, force_refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Get entities from the Redis cache shared by all workers, falling back to the API"""
+        use_shared_cache = redis_cache.connected and settings.KNOWLEDGE_GRAPH_SHARED_CACHE_TTL_SECONDS > 0
+        redis_key = f"{self.SHARED_CACHE_PREFIX}:{key}"
+        
+        if use_shared_cache and not force_refresh:
+            shared = await asyncio.to_thread(redis_cache.get, redis_key)
+            if isinstance(shared, list):
+                return shared
+        
+        entities = await self._fetch_entities(query)
+        if use_shared_cache and entities is not None:
+            await asyncio.to_thread(
+                redis_cache.set, redis_key, entities, settings.KNOWLEDGE_GRAPH_SHARED_CACHE_TTL_SECONDS
+            )
+        return entities
+    
+    async def _fetch_entities(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+        allow_retry: bool = True
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Query the Knowledge Graph API; returns None when the API errors or the circuit is open"""
+        if time.monotonic() < self._circuit_open_until:
+            return None
+        
         params = {
             "query": query,
             "key": self.api_key,
-            "limit": 10,
-            "indent": True,
+            "limit": limit or settings.KNOWLEDGE_GRAPH_RESULT_LIMIT,
             "types": "Organization",
             "languages": "en"
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.base_url, params=params, timeout=30) as response:
-                if response.status == 200:
-                    data = await response.json()
+        client = _http_client.get()
+        try:
+            # One extra attempt, only when rate limited with a short enough Retry-After
+            for attempt in range(2 if allow_retry else 1):
+                response = await client.get(self.base_url, params=params, timeout=timeout if timeout is not None else client.timeout)
+                if response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    self._failure_count = 0
                     return data.get("itemListElement", [])
-                else:
-                    logger.error(f"Knowledge Graph API error: {response.status}")
-                    return []
+                
+                logger.error(f"Knowledge Graph API error: {response.status_code}")
+                retry_after = self._retry_after(response) if response.status_code == 429 and attempt == 0 else None
+                if retry_after is None:
+                    break
+                await asyncio.sleep(retry_after)
+        except httpx.HTTPError:
+            self._record_failure()
+            raise
+        
+        self._record_failure()
+        return None
+    
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Get the Retry-After delay in seconds, or None if it is missing or too long to wait"""
+        value = response.headers.get("Retry-After", "")
+        try:
+            delay = float(value) if value else 1.0
+        except ValueError:
+            return None
+        return delay if 0 <= delay <= self.MAX_RETRY_AFTER_SECONDS else None
+    
+    def _record_failure(self) -> None:
+        """Count an API failure and open the circuit once the threshold is reached"""
+        self._failure_count += 1
+        if self._failure_count >= self.CIRCUIT_FAILURE_THRESHOLD:
+            self._circuit_open_until = time.monotonic() + self.CIRCUIT_COOLDOWN_SECONDS
+            self._failure_count = 0
+            logger.warning(f"Knowledge Graph circuit open for {self.CIRCUIT_COOLDOWN_SECONDS}s after repeated API failures")
     
     def _parse_entity_data(self, entity: Dict[str, Any]) -> Dict[str, Any]:
         """Parse Knowledge Graph entity data"""
@@ -159,64 +333,43 @@ class KnowledgeGraphService(BaseResearchSource):
         if isinstance(types, list):
             # Look for company-related types
             for entity_type in types:
-                if any(company_type in entity_type for company_type in self.company_types):
+                if self._company_type_re.search(str(entity_type)):
                     return entity_type
             return types[0] if types else None
         return types
     
     def _extract_industry(self, entity_data: Dict[str, Any]) -> Optional[str]:
         """Extract industry information"""
-        # Look for industry in various properties
-        industry_sources = [
-            entity_data.get("industry"),
-            entity_data.get("sector"),
-            entity_data.get("businessCategory")
-        ]
-        
-        for source in industry_sources:
+        for field in self._INDUSTRY_FIELDS:
+            source = entity_data.get(field)
             if source:
                 return source
         return None
     
     def _extract_founded_date(self, entity_data: Dict[str, Any]) -> Optional[str]:
         """Extract company founding date"""
-        # Look for founding date in various properties
-        date_sources = [
-            entity_data.get("foundingDate"),
-            entity_data.get("dateFounded"),
-            entity_data.get("established")
-        ]
-        
-        for source in date_sources:
+        for field in self._FOUNDED_DATE_FIELDS:
+            source = entity_data.get(field)
             if source:
                 return source
         return None
     
     def _extract_headquarters(self, entity_data: Dict[str, Any]) -> Optional[str]:
         """Extract company headquarters location"""
-        # Look for headquarters in various properties
-        location_sources = [
-            entity_data.get("location", {}).get("name") if isinstance(entity_data.get("location"), dict) else None,
-            entity_data.get("headquarters"),
-            entity_data.get("addressLocality"),
-            entity_data.get("addressCountry")
-        ]
+        location = entity_data.get("location")
+        if isinstance(location, dict) and location.get("name"):
+            return location["name"]
         
-        for source in location_sources:
+        for field in self._HEADQUARTERS_FIELDS:
+            source = entity_data.get(field)
             if source:
                 return source
         return None
     
     def _extract_ceo(self, entity_data: Dict[str, Any]) -> Optional[str]:
         """Extract CEO information"""
-        # Look for CEO in various properties
-        ceo_sources = [
-            entity_data.get("ceo"),
-            entity_data.get("founder"),
-            entity_data.get("executive")
-        ]
-        
-        for source in ceo_sources:
+        for field in self._CEO_FIELDS:
+            source = entity_data.get(field)
             if source:
                 if isinstance(source, dict):
                     return source.get("name", str(source))
@@ -225,54 +378,32 @@ class KnowledgeGraphService(BaseResearchSource):
     
     def _extract_employees(self, entity_data: Dict[str, Any]) -> Optional[str]:
         """Extract employee count information"""
-        # Look for employee count in various properties
-        employee_sources = [
-            entity_data.get("numberOfEmployees"),
-            entity_data.get("employeeCount"),
-            entity_data.get("staffCount")
-        ]
-        
-        for source in employee_sources:
+        for field in self._EMPLOYEE_FIELDS:
+            source = entity_data.get(field)
             if source:
                 return str(source)
         return None
     
     def _extract_revenue(self, entity_data: Dict[str, Any]) -> Optional[str]:
         """Extract revenue information"""
-        # Look for revenue in various properties
-        revenue_sources = [
-            entity_data.get("revenue"),
-            entity_data.get("annualRevenue"),
-            entity_data.get("turnover")
-        ]
-        
-        for source in revenue_sources:
+        for field in self._REVENUE_FIELDS:
+            source = entity_data.get(field)
             if source:
                 return str(source)
         return None
     
     def _extract_website(self, entity_data: Dict[str, Any]) -> Optional[str]:
         """Extract company website"""
-        # Look for website in various properties
-        website_sources = [
-            entity_data.get("url"),
-            entity_data.get("website"),
-            entity_data.get("homepage")
-        ]
-        
-        for source in website_sources:
+        for field in self._WEBSITE_FIELDS:
+            source = entity_data.get(field)
             if source:
                 return source
         return None
     
     def _extract_social_media(self, entity_data: Dict[str, Any]) -> Optional[Dict[str, str]]:
         """Extract social media profiles"""
-        # Look for social media in various properties
         social_media = {}
-        
-        # Check for common social media properties
-        social_platforms = ["facebook", "twitter", "linkedin", "instagram", "youtube"]
-        for platform in social_platforms:
+        for platform in self._SOCIAL_PLATFORMS:
             if platform in entity_data:
                 social_media[platform] = entity_data[platform]
         
@@ -296,34 +427,22 @@ class KnowledgeGraphService(BaseResearchSource):
             return [str(competitors)]
         return None
     
-    def _deduplicate_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate search results"""
-        seen_ids = set()
-        unique_results = []
+    def _best_result(self, results: List[Dict[str, Any]], company_name: str) -> Optional[Dict[str, Any]]:
+        """Get the most relevant search result"""
+        company_lower = company_name.lower()
         
-        for result in results:
-            entity_id = result.get("result", {}).get("@id")
-            if entity_id not in seen_ids:
-                seen_ids.add(entity_id)
-                unique_results.append(result)
-        
-        return unique_results
-    
-    def _rank_results(self, results: List[Dict[str, Any]], company_name: str) -> List[Dict[str, Any]]:
-        """Rank search results by relevance"""
         def calculate_score(result: Dict[str, Any]) -> float:
             score = 0.0
             entity_data = result.get("result", {})
             
             # Name similarity
             entity_name = entity_data.get("name", "").lower()
-            company_lower = company_name.lower()
             if company_lower in entity_name or entity_name in company_lower:
                 score += 10
             
             # Entity type relevance
             entity_type = entity_data.get("@type", "")
-            if any(company_type in str(entity_type) for company_type in self.company_types):
+            if self._company_type_re.search(str(entity_type)):
                 score += 5
             
             # Description quality
@@ -341,17 +460,13 @@ class KnowledgeGraphService(BaseResearchSource):
             
             return score
         
-        # Sort by calculated score
-        ranked_results = sorted(results, key=calculate_score, reverse=True)
-        return ranked_results
+        # Single pass; only the top result is ever used
+        return max(results, key=calculate_score, default=None)
     
     def _clean_domain(self, domain: str) -> str:
         """Clean domain string"""
-        if domain.startswith(('http://', 'https://')):
-            domain = domain.split('://', 1)[1]
-        if domain.startswith('www.'):
-            domain = domain[4:]
-        return domain.lower()
+        match = _DOMAIN_RE.match(domain)
+        return (match.group(1) if match else domain).lower()
     
     def _create_empty_result(self, company_name: str) -> Dict[str, Any]:
         """Create empty result when no entity is found"""
@@ -383,9 +498,13 @@ class KnowledgeGraphService(BaseResearchSource):
     
     async def test_connection(self) -> bool:
         """Test Knowledge Graph service connection"""
+        if not self.api_key:
+            return False
+        
+        # A single uncached one-result lookup is enough to prove the API answers
         try:
-            result = await self.research("Google")
-            return bool(result and result.get("name"))
+            entities = await self._fetch_entities("Google", limit=1, timeout=5.0, allow_retry=False)
+            return bool(entities)
         except Exception as e:
             logger.error(f"Knowledge Graph service test failed: {str(e)}")
             return False
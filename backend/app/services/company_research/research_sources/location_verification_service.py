@@ -4,25 +4,46 @@ Fetches location data from Google Places API and Nominatim OSM API
 Compares data sources and provides authenticity scoring
 """
 import asyncio
-import aiohttp
+import hashlib
 import logging
 import math
 from typing import Dict, Any, Optional, Tuple, List
-from datetime import datetime
 import re
 from urllib.parse import quote_plus
 
 from .base_research_source import BaseResearchSource
 from app.models.schemas.company_research import (
-    ResearchSource, LocationData, LocationComparison, LocationVerificationData
+    ResearchSource, LocationData, LocationComparison, LocationVerificationData,
+    build_trusted
 )
 from app.config.settings import settings
+from app.core.http_client import SharedHTTPClient
+from app.core.redis_cache import redis_cache
+from app.core.request_context import request_now
+
+try:
+    from rapidfuzz import fuzz, utils
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Punctuation stripped from company names before building a search query
+_CLEAN_RE = re.compile(r'[^\w\s]')
+
+_RADIANS_PER_DEGREE = math.pi / 180
+# Twice the mean Earth radius (6371 km), as used by the Haversine formula
+_EARTH_DIAMETER_KM = 12742.0
+
+# Shared HTTP client for Google Places and Nominatim lookups
+_http_client = SharedHTTPClient(timeout=30.0)
+
 class LocationVerificationService(BaseResearchSource):
     """Location verification service using multiple data sources"""
     
+    CACHE_PREFIX = "locverify"
+    
     def __init__(self):
         """Initialize location verification service"""
         super().__init__(ResearchSource.LOCATION_VERIFICATION)
@@ -39,6 +60,12 @@ class LocationVerificationService(BaseResearchSource):
             # Create search query
             search_query = self._create_search_query(company_name, company_domain)
             
+            # Reuse a recent verification for the same query (shared by all workers)
+            cache_key = self._cache_key(search_query)
+            cached = await self._get_cached(cache_key)
+            if cached is not None:
+                return cached
+            
             # Fetch data from both sources in parallel
             google_data, nominatim_data = await asyncio.gather(
                 self._fetch_google_places_data(search_query),
@@ -72,7 +99,8 @@ class LocationVerificationService(BaseResearchSource):
             risk_factors, trust_indicators = self._identify_factors(google_data, nominatim_data, comparison)
             
             # Build verification data
-            verification_data = LocationVerificationData(
+            verification_data = build_trusted(
+                LocationVerificationData,
                 company_name=company_name,
                 search_query=search_query,
                 google_places_data=google_data,
@@ -84,16 +112,45 @@ class LocationVerificationService(BaseResearchSource):
                 trust_indicators=trust_indicators
             )
             
+            # Only cache lookups that found something; a total miss may be a transient outage
+            if google_data or nominatim_data:
+                await self._set_cached(cache_key, verification_data)
+            
             return verification_data.model_dump()
             
         except Exception as e:
             logger.error(f"Location verification failed: {str(e)}")
             return self._create_error_response(company_name, str(e))
     
+    def _is_cacheable(self, data: Dict[str, Any]) -> bool:
+        """Only share verifications that got data; errors and total misses may be transient outages"""
+        return not data.get("error") and bool(data.get("google_places_data") or data.get("nominatim_osm_data"))
+    
+    def _cache_key(self, search_query: str) -> str:
+        """Build the cache key; case and spacing don't change the lookup"""
+        normalized = " ".join(search_query.lower().split())
+        return f"{self.CACHE_PREFIX}:{hashlib.sha1(normalized.encode()).hexdigest()}"
+    
+    async def _get_cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached verification result, if caching is enabled and Redis has one"""
+        if not redis_cache.connected or settings.LOCATION_VERIFICATION_CACHE_TTL_SECONDS <= 0:
+            return None
+        cached = await asyncio.to_thread(redis_cache.get, cache_key)
+        return cached if isinstance(cached, dict) else None
+    
+    async def _set_cached(self, cache_key: str, verification_data: LocationVerificationData) -> None:
+        """Store a verification result for later lookups of the same query"""
+        if not redis_cache.connected or settings.LOCATION_VERIFICATION_CACHE_TTL_SECONDS <= 0:
+            return
+        await asyncio.to_thread(
+            redis_cache.set, cache_key, verification_data.model_dump_json(),
+            settings.LOCATION_VERIFICATION_CACHE_TTL_SECONDS
+        )
+    
     def _create_search_query(self, company_name: str, company_domain: Optional[str] = None) -> str:
         """Create optimized search query for location APIs"""
         # Clean company name
-        clean_name = re.sub(r'[^\w\s]', ' ', company_name).strip()
+        clean_name = _CLEAN_RE.sub(' ', company_name).strip()
         
         if company_domain:
             # Try to extract location from domain
@@ -119,20 +176,19 @@ class LocationVerificationService(BaseResearchSource):
                 'type': 'establishment'
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url, params=params, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        if data.get('status') == 'OK' and data.get('results'):
-                            place = data['results'][0]  # Get first result
-                            return self._parse_google_places_result(place)
-                        else:
-                            logger.warning(f"Google Places API returned status: {data.get('status')}")
-                            return None
-                    else:
-                        logger.error(f"Google Places API error: {response.status}")
-                        return None
+            response = await _http_client.get().get(search_url, params=params)
+            if response.status_code == 200:
+                data = response.json()
+                
+                if data.get('status') == 'OK' and data.get('results'):
+                    place = data['results'][0]  # Get first result
+                    return self._parse_google_places_result(place)
+                else:
+                    logger.warning(f"Google Places API returned status: {data.get('status')}")
+                    return None
+            else:
+                logger.error(f"Google Places API error: {response.status_code}")
+                return None
                         
         except Exception as e:
             logger.error(f"Error fetching Google Places data: {str(e)}")
@@ -159,7 +215,8 @@ class LocationVerificationService(BaseResearchSource):
             longitude=location.get('lng'),
             formatted_address=place.get('formatted_address'),
             place_id=place.get('place_id'),
-            confidence_score=0.9  # Google Places is generally reliable
+            confidence_score=0.9,  # Google Places is generally reliable
+            last_updated=request_now()
         )
     
     def _extract_address_components(self, components: List[Dict[str, Any]]) -> Dict[str, str]:
@@ -195,20 +252,19 @@ class LocationVerificationService(BaseResearchSource):
                 'accept-language': 'en'
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url, params=params, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        if data and isinstance(data, list) and len(data) > 0:
-                            place = data[0]
-                            return self._parse_nominatim_result(place)
-                        else:
-                            logger.warning("Nominatim OSM API returned no results")
-                            return None
-                    else:
-                        logger.error(f"Nominatim OSM API error: {response.status}")
-                        return None
+            response = await _http_client.get().get(search_url, params=params)
+            if response.status_code == 200:
+                data = response.json()
+                
+                if data and isinstance(data, list) and len(data) > 0:
+                    place = data[0]
+                    return self._parse_nominatim_result(place)
+                else:
+                    logger.warning("Nominatim OSM API returned no results")
+                    return None
+            else:
+                logger.error(f"Nominatim OSM API error: {response.status_code}")
+                return None
                         
         except Exception as e:
             logger.error(f"Error fetching Nominatim OSM data: {str(e)}")
@@ -228,7 +284,9 @@ class LocationVerificationService(BaseResearchSource):
             latitude=float(place.get('lat', 0)),
             longitude=float(place.get('lon', 0)),
             formatted_address=place.get('display_name'),
-            confidence_score=0.8  # OSM data quality varies
+            place_id=None,
+            confidence_score=0.8,  # OSM data quality varies
+            last_updated=request_now()
         )
     
     def _compare_location_data(self, google_data: LocationData, nominatim_data: LocationData) -> LocationComparison:
@@ -238,17 +296,17 @@ class LocationVerificationService(BaseResearchSource):
         
         # Calculate coordinate distance
         coordinate_distance = None
-        if google_data.latitude and google_data.longitude and nominatim_data.latitude and nominatim_data.longitude:
+        if google_data["latitude"] and google_data["longitude"] and nominatim_data["latitude"] and nominatim_data["longitude"]:
             coordinate_distance = self._calculate_distance(
-                google_data.latitude, google_data.longitude,
-                nominatim_data.latitude, nominatim_data.longitude
+                google_data["latitude"], google_data["longitude"],
+                nominatim_data["latitude"], nominatim_data["longitude"]
             )
         
         # Check field matches
-        city_match = self._compare_fields(google_data.city, nominatim_data.city)
-        state_match = self._compare_fields(google_data.state, nominatim_data.state)
-        country_match = self._compare_fields(google_data.country, nominatim_data.country)
-        postal_code_match = self._compare_fields(google_data.postal_code, nominatim_data.postal_code)
+        city_match = self._compare_fields(google_data["city"], nominatim_data["city"])
+        state_match = self._compare_fields(google_data["state"], nominatim_data["state"])
+        country_match = self._compare_fields(google_data["country"], nominatim_data["country"])
+        postal_code_match = self._compare_fields(google_data["postal_code"], nominatim_data["postal_code"])
         
         # Calculate overall confidence
         overall_confidence = self._calculate_overall_confidence(
@@ -270,17 +328,29 @@ class LocationVerificationService(BaseResearchSource):
         # Single source gets moderate confidence
         return LocationComparison(
             address_similarity_score=0.5,
+            coordinate_distance_km=None,
+            city_match=False,
+            state_match=False,
+            country_match=False,
+            postal_code_match=False,
             overall_location_confidence=0.6
         )
     
     def _calculate_address_similarity(self, google_data: LocationData, nominatim_data: LocationData) -> float:
         """Calculate similarity between addresses using fuzzy matching"""
-        if not google_data.formatted_address or not nominatim_data.formatted_address:
+        if not google_data["formatted_address"] or not nominatim_data["formatted_address"]:
             return 0.0
         
-        # Simple word-based similarity (can be enhanced with more sophisticated algorithms)
-        google_words = set(google_data.formatted_address.lower().split())
-        nominatim_words = set(nominatim_data.formatted_address.lower().split())
+        if RAPIDFUZZ_AVAILABLE:
+            # Token-set ratio ignores case, punctuation, word order and repeated tokens; scored 0-100
+            return fuzz.token_set_ratio(
+                google_data["formatted_address"], nominatim_data["formatted_address"],
+                processor=utils.default_process
+            ) / 100.0
+        
+        # Fallback: simple word-based (Jaccard) similarity
+        google_words = set(google_data["formatted_address"].lower().split())
+        nominatim_words = set(nominatim_data["formatted_address"].lower().split())
         
         if not google_words or not nominatim_words:
             return 0.0
@@ -292,19 +362,14 @@ class LocationVerificationService(BaseResearchSource):
     
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """Calculate distance between two coordinates using Haversine formula"""
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        # Earth's radius in kilometers
-        r = 6371
-        
-        return c * r
+        phi1 = lat1 * _RADIANS_PER_DEGREE
+        phi2 = lat2 * _RADIANS_PER_DEGREE
+        dlat = phi2 - phi1
+        dlon = (lon2 - lon1) * _RADIANS_PER_DEGREE
+        
+        a = math.sin(dlat * 0.5) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlon * 0.5) ** 2
+        # atan2 form stays accurate near antipodal points, where a can round slightly past 1
+        return _EARTH_DIAMETER_KM * math.atan2(math.sqrt(a), math.sqrt(max(0.0, 1.0 - a)))
     
     def _compare_fields(self, field1: Optional[str], field2: Optional[str]) -> bool:
         """Compare two fields for exact or fuzzy matching"""
@@ -363,18 +428,18 @@ class LocationVerificationService(BaseResearchSource):
             return 0.5  # Neutral score when no comparison available
         
         # Base score from comparison
-        base_score = comparison.overall_location_confidence
+        base_score = comparison["overall_location_confidence"]
         
         # Bonus for having both sources
         if google_data and nominatim_data:
             base_score += 0.1
         
         # Bonus for high confidence data
-        if google_data and google_data.confidence_score:
-            base_score += google_data.confidence_score * 0.1
+        if google_data and google_data["confidence_score"]:
+            base_score += google_data["confidence_score"] * 0.1
         
-        if nominatim_data and nominatim_data.confidence_score:
-            base_score += nominatim_data.confidence_score * 0.1
+        if nominatim_data and nominatim_data["confidence_score"]:
+            base_score += nominatim_data["confidence_score"] * 0.1
         
         return min(1.0, base_score)
     
@@ -399,20 +464,20 @@ class LocationVerificationService(BaseResearchSource):
         if not google_data and not nominatim_data:
             risk_factors.append("No location data found")
         
-        if comparison and comparison.coordinate_distance_km and comparison.coordinate_distance_km > 10:
-            risk_factors.append(f"Large coordinate discrepancy ({comparison.coordinate_distance_km:.1f}km)")
+        if comparison and comparison["coordinate_distance_km"] and comparison["coordinate_distance_km"] > 10:
+            risk_factors.append(f"Large coordinate discrepancy ({comparison['coordinate_distance_km']:.1f}km)")
         
-        if comparison and comparison.address_similarity_score < 0.3:
+        if comparison and comparison["address_similarity_score"] < 0.3:
             risk_factors.append("Low address similarity between sources")
         
         # Trust indicators
         if google_data and nominatim_data:
             trust_indicators.append("Data available from multiple sources")
         
-        if comparison and comparison.city_match and comparison.country_match:
+        if comparison and comparison["city_match"] and comparison["country_match"]:
             trust_indicators.append("City and country match between sources")
         
-        if comparison and comparison.coordinate_distance_km and comparison.coordinate_distance_km < 1:
+        if comparison and comparison["coordinate_distance_km"] and comparison["coordinate_distance_km"] < 1:
             trust_indicators.append("Coordinates closely match between sources")
         
         return risk_factors, trust_indicators
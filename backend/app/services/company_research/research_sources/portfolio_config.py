@@ -1,8 +1,9 @@
 """
 Configuration for Portfolio Research Service
 """
-from typing import List, Dict, Any
-from dataclasses import dataclass
+import re
+from typing import List, Dict, Any, Optional, Pattern
+from dataclasses import dataclass, field
 
 @dataclass
 class PortfolioResearchConfig:
@@ -37,6 +38,9 @@ class PortfolioResearchConfig:
     # Industry keywords
     industry_keywords: List[str] = None
     
+    # All technology patterns compiled into one case-insensitive regex (built from technology_patterns)
+    technology_regex: Optional[Pattern[str]] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Set default values for lists"""
         if self.portfolio_keywords is None:
@@ -68,6 +72,11 @@ class PortfolioResearchConfig:
                 "government", "nonprofit", "startup", "enterprise", "sme", "ecommerce",
                 "saas", "b2b", "b2c", "fintech", "healthtech", "edtech", "proptech"
             ]
+        
+        self.technology_regex = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.technology_patterns),
+            re.IGNORECASE
+        )
 
 # Default configuration
 DEFAULT_CONFIG = PortfolioResearchConfig()
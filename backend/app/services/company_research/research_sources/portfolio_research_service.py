@@ -32,7 +32,7 @@ from sumy.utils import get_stop_words
 
 from app.services.company_research.research_sources.base_research_source import BaseResearchSource
 from app.models.schemas.company_research import ResearchSource, ResearchStatus, ResearchTaskResult
-from app.services.llm.llm_orchestrator import LLMOrchestrator
+from app.services.llm.llm_orchestrator import llm_orchestrator
 from .portfolio_config import PortfolioResearchConfig, DEFAULT_CONFIG, CONFIG_PRESETS
 
 logger = logging.getLogger(__name__)
@@ -43,7 +43,7 @@ class PortfolioResearchService(BaseResearchSource):
     def __init__(self, api_key: Optional[str] = None, config: Optional[PortfolioResearchConfig] = None):
         """Initialize the portfolio research service"""
         super().__init__(ResearchSource.PORTFOLIO_RESEARCH, api_key)
-        self.llm_orchestrator = LLMOrchestrator()
+        self.llm_orchestrator = llm_orchestrator
         
         # Use provided config or default
         self.config = config or DEFAULT_CONFIG
@@ -276,10 +276,8 @@ class PortfolioResearchService(BaseResearchSource):
         """Extract structured information from page data"""
         text = page_data.get("text", "").lower()
         
-        # Extract technologies using config patterns
-        for pattern in self.config.technology_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            portfolio_data["technologies"].extend(matches)
+        # Extract technologies using the config's combined pattern in a single pass
+        portfolio_data["technologies"].extend(self.config.technology_regex.findall(text))
         
         # Remove duplicates
         portfolio_data["technologies"] = list(set(portfolio_data["technologies"]))
@@ -298,11 +296,12 @@ class PortfolioResearchService(BaseResearchSource):
                 current_provider = self.llm_orchestrator.get_current_provider()
             
             if current_provider:
-                response = await current_provider.generate_response(
-                    prompt=prompt,
-                    max_tokens=self.config.max_tokens,
-                    temperature=self.config.temperature
-                )
+                async with self.llm_orchestrator.get_provider_semaphore(current_provider):
+                    response = await current_provider.generate_response(
+                        prompt=prompt,
+                        max_tokens=self.config.max_tokens,
+                        temperature=self.config.temperature
+                    )
                 
                 return {
                     "summary": response.get("content", ""),
@@ -13,6 +13,7 @@ import re
 from .base_research_source import BaseResearchSource
 from app.models.schemas.company_research import ResearchSource, WebSearchResult
 from app.config.settings import settings
+from app.core.request_context import request_now
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +71,7 @@ class WebSearchService(BaseResearchSource):
             "search_results": ranked_results,
             "total_results": len(ranked_results),
             "search_queries": queries,
-            "search_timestamp": datetime.utcnow()
+            "search_timestamp": request_now()
         }
     
     def _generate_search_queries(self, company_name: str, company_domain: Optional[str] = None) -> List[str]:
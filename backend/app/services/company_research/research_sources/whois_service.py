@@ -13,6 +13,7 @@ import whois
 from .base_research_source import BaseResearchSource
 from app.models.schemas.company_research import ResearchSource, WHOISData
 from app.config.settings import settings
+from app.core.request_context import request_now
 
 logger = logging.getLogger(__name__)
 
@@ -126,7 +127,7 @@ class WHOISService(BaseResearchSource):
                 "admin_contact": self._extract_contact_info(whois_result, 'admin'),
                 "tech_contact": self._extract_contact_info(whois_result, 'tech'),
                 "dnssec": getattr(whois_result, 'dnssec', None),
-                "last_checked": datetime.utcnow(),
+                "last_checked": request_now(),
                 "raw_text": getattr(whois_result, 'text', None)
             }
             
@@ -222,7 +223,7 @@ class WHOISService(BaseResearchSource):
         """Create basic domain information when detailed lookup fails"""
         return {
             "domain": domain,
-            "last_checked": datetime.utcnow(),
+            "last_checked": request_now(),
             "note": "Basic domain validation only - detailed WHOIS lookup failed"
         }
     
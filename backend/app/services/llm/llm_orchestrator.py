@@ -2,8 +2,10 @@
 LLM Orchestrator Service
 Manages LLM provider selection, switching, and orchestration
 """
+import asyncio
 import logging
 from typing import Dict, Any, Optional
+from app.config.settings import settings
 from .provider_factory import LLMProviderFactory
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,8 @@ class LLMOrchestrator:
     def __init__(self):
         """Initialize the LLM orchestrator"""
         self.provider_factory = LLMProviderFactory()
+        # provider name -> semaphore bounding in-flight requests to that provider
+        self._provider_semaphores: Dict[str, asyncio.Semaphore] = {}
         logger.info("LLM orchestrator initialized")
     
     def get_provider(self, provider_name: str = None) -> Optional[Any]:
@@ -24,6 +28,18 @@ class LLMOrchestrator:
         """Get the current selected LLM provider"""
         return self.provider_factory.get_current_provider()
     
+    def get_provider_semaphore(self, provider: Any) -> asyncio.Semaphore:
+        """Get the semaphore that bounds concurrent requests to a provider"""
+        semaphore = self._provider_semaphores.get(provider.provider_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+            self._provider_semaphores[provider.provider_name] = semaphore
+        return semaphore
+    
+    async def close(self) -> None:
+        """Close provider clients at shutdown"""
+        await self.provider_factory.close()
+    
     def switch_provider(self, provider_name: str) -> bool:
         """Switch to a different LLM provider"""
         return self.provider_factory.switch_provider(provider_name)
@@ -93,3 +109,6 @@ class LLMOrchestrator:
         except Exception as e:
             logger.error(f"Auto-provider selection failed: {str(e)}")
             return False
+
+# Global LLM orchestrator instance, shared so every service reuses the same provider clients
+llm_orchestrator = LLMOrchestrator()
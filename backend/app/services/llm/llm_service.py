@@ -8,7 +8,7 @@ from typing import Dict, Any, Optional
 from datetime import date
 from app.core.exceptions.exceptions import LLMServiceError, InsufficientCredits
 from app.config.settings import settings
-from .llm_orchestrator import LLMOrchestrator
+from .llm_orchestrator import llm_orchestrator
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ class LLMService:
         self.premium_tier_daily_limit = settings.PREMIUM_TIER_DAILY_LIMIT
         
         # Initialize orchestrator
-        self.orchestrator = LLMOrchestrator()
+        self.orchestrator = llm_orchestrator
         
         logger.info("LLM service initialized with orchestrator")
     
@@ -66,11 +66,12 @@ class LLMService:
             prompt = self._create_analysis_prompt(resume_content, job_description_content)
             
             # Generate insights using LLM
-            llm_response = await provider.generate_response(
-                prompt=prompt,
-                max_tokens=1500,
-                temperature=0.7
-            )
+            async with self.orchestrator.get_provider_semaphore(provider):
+                llm_response = await provider.generate_response(
+                    prompt=prompt,
+                    max_tokens=1500,
+                    temperature=0.7
+                )
             
             # Increment usage counter
             self._increment_usage(user_id)
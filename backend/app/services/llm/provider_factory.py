@@ -229,6 +229,14 @@ class LLMProviderFactory:
                 "error": str(e)
             }
     
+    async def close(self) -> None:
+        """Close every provider's network resources"""
+        for provider in self.providers.values():
+            try:
+                await provider.close()
+            except Exception as e:
+                logger.warning(f"Failed to close {provider.provider_name} provider: {str(e)}")
+    
     def get_provider_status(self) -> Dict[str, Any]:
         """Get overall status of all providers"""
         return {
@@ -2,9 +2,12 @@
 Base abstract class for LLM providers
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import httpx
 import logging
 
+from app.core.http_client import create_http_client
+
 class BaseLLMProvider(ABC):
     """Abstract base class for LLM providers"""
     
@@ -33,7 +36,8 @@ class BaseLLMProvider(ABC):
         self, 
         prompt: str, 
         max_tokens: int = 1000,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        instructions: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate a response from the LLM
@@ -42,6 +46,8 @@ class BaseLLMProvider(ABC):
             prompt: Input prompt
             max_tokens: Maximum tokens to generate
             temperature: Creativity level (0.0 to 1.0)
+            instructions: Static task instructions sent ahead of the prompt, kept
+                identical across calls so providers can reuse the cached prefix
             
         Returns:
             Response dictionary with content and metadata
@@ -53,6 +59,25 @@ class BaseLLMProvider(ABC):
         """Get information about the current model"""
         pass
     
+    SYSTEM_PROMPT = "You are an expert HR analyst and career coach."
+    
+    @staticmethod
+    def _create_http_client() -> httpx.AsyncClient:
+        """Create a pooled client so concurrent requests share (multiplexed) connections"""
+        return create_http_client(timeout=60.0, max_connections=32, max_keepalive_connections=32)
+    
+    async def close(self) -> None:
+        """Release network resources held by the provider"""
+        pass
+    
+    def _build_messages(self, prompt: str, instructions: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build chat messages with every static part ahead of the per-call prompt"""
+        messages = [{"role": "system", "content": self.SYSTEM_PROMPT}]
+        if instructions:
+            messages.append({"role": "system", "content": instructions})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
     def log_request(self, prompt: str, max_tokens: int, temperature: float) -> None:
         """Log LLM request details"""
         self.logger.info(
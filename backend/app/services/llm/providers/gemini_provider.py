@@ -3,7 +3,7 @@ Gemini LLM provider implementation
 """
 import time
 import google.generativeai as genai
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .base_provider import BaseLLMProvider
 
 class GeminiProvider(BaseLLMProvider):
@@ -38,7 +38,8 @@ class GeminiProvider(BaseLLMProvider):
         self, 
         prompt: str, 
         max_tokens: int = 1000,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        instructions: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate response using Gemini
@@ -47,6 +48,8 @@ class GeminiProvider(BaseLLMProvider):
             prompt: Input prompt
             max_tokens: Maximum tokens to generate
             temperature: Creativity level (0.0 to 1.0)
+            instructions: Static task instructions sent ahead of the prompt, kept
+                identical across calls so providers can reuse the cached prefix
             
         Returns:
             Response dictionary with content and metadata
@@ -54,11 +57,15 @@ class GeminiProvider(BaseLLMProvider):
         start_time = time.time()
         
         try:
+            # Static instructions lead so the varying prompt only ever extends them
+            if instructions:
+                prompt = f"{instructions}\n\n{prompt}"
+            
             # Log the request
             self.log_request(prompt, max_tokens, temperature)
             
             # Generate response
-            response = self.model.generate_content(
+            response = await self.model.generate_content_async(
                 prompt,
                 generation_config=genai.types.GenerationConfig(
                     max_output_tokens=max_tokens,
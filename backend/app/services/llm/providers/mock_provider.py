@@ -3,7 +3,7 @@ Mock LLM provider for testing and development
 """
 import time
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .base_provider import BaseLLMProvider
 import asyncio
 
@@ -32,7 +32,8 @@ class MockProvider(BaseLLMProvider):
         self, 
         prompt: str, 
         max_tokens: int = 1000,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        instructions: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate mock response
@@ -41,6 +42,8 @@ class MockProvider(BaseLLMProvider):
             prompt: Input prompt
             max_tokens: Maximum tokens to generate
             temperature: Creativity level (0.0 to 1.0)
+            instructions: Static task instructions sent ahead of the prompt, kept
+                identical across calls so providers can reuse the cached prefix
             
         Returns:
             Mock response dictionary
@@ -48,6 +51,10 @@ class MockProvider(BaseLLMProvider):
         start_time = time.time()
         
         try:
+            # Static instructions lead so the varying prompt only ever extends them
+            if instructions:
+                prompt = f"{instructions}\n\n{prompt}"
+            
             # Log the request
             self.log_request(prompt, max_tokens, temperature)
             
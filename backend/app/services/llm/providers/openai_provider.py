@@ -2,8 +2,8 @@
 OpenAI LLM provider implementation
 """
 import time
-from typing import Dict, Any
-from openai import OpenAI
+from typing import Dict, Any, Optional
+from openai import AsyncOpenAI
 from .base_provider import BaseLLMProvider
 
 class OpenAIProvider(BaseLLMProvider):
@@ -20,10 +20,15 @@ class OpenAIProvider(BaseLLMProvider):
         super().__init__(api_key, model_name)
         
         # Configure OpenAI client
-        self.client = OpenAI(api_key=self.api_key)
+        self.http_client = self._create_http_client()
+        self.client = AsyncOpenAI(api_key=self.api_key, http_client=self.http_client)
         
         self.logger.info(f"OpenAI provider initialized with model: {self.model_name}")
     
+    async def close(self) -> None:
+        """Close the pooled HTTP client"""
+        await self.http_client.aclose()
+    
     def get_default_model(self) -> str:
         """Get default OpenAI model"""
         return "gpt-3.5-turbo"
@@ -32,7 +37,8 @@ class OpenAIProvider(BaseLLMProvider):
         self, 
         prompt: str, 
         max_tokens: int = 1000,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        instructions: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate response using OpenAI
@@ -41,6 +47,8 @@ class OpenAIProvider(BaseLLMProvider):
             prompt: Input prompt
             max_tokens: Maximum tokens to generate
             temperature: Creativity level (0.0 to 1.0)
+            instructions: Static task instructions sent ahead of the prompt, kept
+                identical across calls so providers can reuse the cached prefix
             
         Returns:
             Response dictionary with content and metadata
@@ -52,12 +60,9 @@ class OpenAIProvider(BaseLLMProvider):
             self.log_request(prompt, max_tokens, temperature)
             
             # Generate response
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are an expert HR analyst and career coach."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._build_messages(prompt, instructions),
                 max_tokens=max_tokens,
                 temperature=temperature,
                 top_p=0.8,
@@ -2,8 +2,8 @@
 Parallel AI LLM provider implementation using OpenAI SDK compatibility
 """
 import time
-from typing import Dict, Any
-from openai import OpenAI
+from typing import Dict, Any, Optional
+from openai import AsyncOpenAI
 from .base_provider import BaseLLMProvider
 
 class ParallelProvider(BaseLLMProvider):
@@ -20,13 +20,19 @@ class ParallelProvider(BaseLLMProvider):
         super().__init__(api_key, model_name)
         
         # Configure Parallel AI client using OpenAI SDK compatibility
-        self.client = OpenAI(
+        self.http_client = self._create_http_client()
+        self.client = AsyncOpenAI(
             api_key=self.api_key,
-            base_url="https://api.parallel.ai"  # Parallel's API beta endpoint
+            base_url="https://api.parallel.ai",  # Parallel's API beta endpoint
+            http_client=self.http_client
         )
         
         self.logger.info(f"Parallel AI provider initialized with model: {self.model_name}")
     
+    async def close(self) -> None:
+        """Close the pooled HTTP client"""
+        await self.http_client.aclose()
+    
     def get_default_model(self) -> str:
         """Get default Parallel AI model"""
         return "speed"  # Parallel's optimized model for low latency
@@ -35,7 +41,8 @@ class ParallelProvider(BaseLLMProvider):
         self, 
         prompt: str, 
         max_tokens: int = 1000,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        instructions: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate response using Parallel AI
@@ -44,6 +51,8 @@ class ParallelProvider(BaseLLMProvider):
             prompt: Input prompt
             max_tokens: Maximum tokens to generate
             temperature: Creativity level (0.0 to 1.0)
+            instructions: Static task instructions sent ahead of the prompt, kept
+                identical across calls so providers can reuse the cached prefix
             
         Returns:
             Response dictionary with content and metadata
@@ -55,12 +64,9 @@ class ParallelProvider(BaseLLMProvider):
             self.log_request(prompt, max_tokens, temperature)
             
             # Generate response using Parallel AI's "speed" model
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are an expert HR analyst and career coach."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._build_messages(prompt, instructions),
                 max_tokens=max_tokens,
                 temperature=temperature,
                 top_p=0.8,
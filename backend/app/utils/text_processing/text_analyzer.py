@@ -7,6 +7,7 @@ import math
 from typing import Dict, List, Set, Tuple
 from collections import Counter
 import nltk
+import numpy as np
 from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
@@ -14,6 +15,12 @@ from nltk.tag import pos_tag
 
 logger = logging.getLogger(__name__)
 
+# Translation table for stripping punctuation, built once
+PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
+# Vocabulary size above which keyword set operations switch to numpy
+NUMPY_KEYWORD_THRESHOLD = 5000
+
 class TextAnalyzer:
     """Handles basic text analysis operations"""
     
@@ -23,6 +30,13 @@ class TextAnalyzer:
         self.lemmatizer = WordNetLemmatizer()
         self.stop_words = set(stopwords.words('english'))
         
+        # Force-load the lazy WordNet corpus up front; analyses run in worker
+        # threads and NLTK's lazy loader is not safe to trigger concurrently
+        try:
+            self.lemmatizer.lemmatize("warmup")
+        except Exception as e:
+            logger.warning(f"Failed to preload WordNet: {str(e)}")
+        
         # Common skills and categories
         self.hard_skills = {
             'programming': ['python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'rust', 'swift', 'kotlin'],
@@ -46,6 +60,24 @@ class TextAnalyzer:
             'initiated', 'launched', 'led', 'managed', 'optimized', 'organized',
             'planned', 'reduced', 'resolved', 'streamlined', 'supervised', 'transformed'
         ]
+        
+        # Term -> ((skill group, position), ...) so extraction is a single lookup pass
+        self._skill_index = self._build_skill_index()
+    
+    def _build_skill_index(self) -> Dict[str, Tuple[Tuple[str, int], ...]]:
+        """Build a lookup table over every known skill term, preserving list order"""
+        groups = {
+            'hard_skills': [skill for skill_list in self.hard_skills.values() for skill in skill_list],
+            'soft_skills': self.soft_skills,
+            'action_verbs': self.action_verbs
+        }
+        
+        index: Dict[str, List[Tuple[str, int]]] = {}
+        for group, terms in groups.items():
+            for position, term in enumerate(terms):
+                index.setdefault(term, []).append((group, position))
+        
+        return {term: tuple(entries) for term, entries in index.items()}
     
     def _setup_nltk(self):
         """Download required NLTK data"""
@@ -58,30 +90,35 @@ class TextAnalyzer:
         except Exception as e:
             logger.warning(f"Failed to setup NLTK data: {str(e)}")
     
+    def _preprocess_tokens(self, text: str, remove_stopwords: bool = True, lemmatize: bool = True) -> List[str]:
+        """Clean, tokenize and normalize text into a list of tokens"""
+        if not text or not text.strip():
+            return []
+        
+        # Convert to lowercase and remove punctuation
+        text = text.lower().translate(PUNCTUATION_TABLE)
+        
+        # Tokenize
+        tokens = word_tokenize(text)
+        
+        # Remove stopwords if requested
+        if remove_stopwords:
+            stop_words = self.stop_words
+            tokens = [token for token in tokens if token not in stop_words and token.isalpha()]
+        else:
+            tokens = [token for token in tokens if token.isalpha()]
+        
+        # Lemmatize if requested
+        if lemmatize:
+            lemmatize_token = self.lemmatizer.lemmatize
+            tokens = [lemmatize_token(token) for token in tokens]
+        
+        return tokens
+    
     def preprocess_text(self, text: str, remove_stopwords: bool = True, lemmatize: bool = True) -> str:
         """Preprocess text by cleaning and normalizing"""
         try:
-            if not text or not text.strip():
-                return ""
-            
-            # Convert to lowercase and remove punctuation
-            text = text.lower()
-            text = text.translate(str.maketrans("", "", string.punctuation))
-            
-            # Tokenize
-            tokens = word_tokenize(text)
-            
-            # Remove stopwords if requested
-            if remove_stopwords:
-                tokens = [token for token in tokens if token not in self.stop_words and token.isalpha()]
-            else:
-                tokens = [token for token in tokens if token.isalpha()]
-            
-            # Lemmatize if requested
-            if lemmatize:
-                tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
-            
-            return " ".join(tokens)
+            return " ".join(self._preprocess_tokens(text, remove_stopwords, lemmatize))
             
         except Exception as e:
             logger.error(f"Text preprocessing failed: {str(e)}")
@@ -91,17 +128,39 @@ class TextAnalyzer:
         """Get word frequency from text"""
         try:
             if preprocess:
-                processed_text = self.preprocess_text(text)
+                # Preprocessed tokens are already single alphabetic words, no re-tokenizing needed
+                words = self._preprocess_tokens(text)
             else:
-                processed_text = text
+                words = word_tokenize(text)
             
-            words = word_tokenize(processed_text)
             return dict(Counter(words))
             
         except Exception as e:
             logger.error(f"Word frequency analysis failed: {str(e)}")
             return {}
     
+    @staticmethod
+    def word_frequency_arrays(word_freq: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert a word frequency dict into parallel (vocabulary, counts) arrays"""
+        vocab = np.array(list(word_freq.keys()), dtype=str)
+        counts = np.fromiter(word_freq.values(), dtype=np.int32, count=len(word_freq))
+        return vocab, counts
+    
+    def compare_keywords(self, jd_freq: Dict[str, int], resume_freq: Dict[str, int]) -> Tuple[List[str], List[str]]:
+        """Get (common, missing) JD keywords relative to the resume"""
+        if len(jd_freq) + len(resume_freq) < NUMPY_KEYWORD_THRESHOLD:
+            # Dict key views support set operations directly
+            jd_keywords = jd_freq.keys()
+            resume_keywords = resume_freq.keys()
+            return list(jd_keywords & resume_keywords), list(jd_keywords - resume_keywords)
+        
+        # Large vocabularies: one C-level sort + merge over fixed-width string arrays
+        jd_vocab, _ = self.word_frequency_arrays(jd_freq)
+        resume_vocab, _ = self.word_frequency_arrays(resume_freq)
+        common = np.intersect1d(jd_vocab, resume_vocab, assume_unique=True)
+        missing = np.setdiff1d(jd_vocab, resume_vocab, assume_unique=True)
+        return common.tolist(), missing.tolist()
+    
     def calculate_similarity(self, text1: str, text2: str, method: str = "jaccard") -> float:
         """Calculate similarity between two texts"""
         try:
@@ -177,32 +236,25 @@ class TextAnalyzer:
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
         """Extract skills from text"""
         try:
-            processed_text = self.preprocess_text(text, remove_stopwords=False)
-            words = set(word_tokenize(processed_text))
+            words = set(self._preprocess_tokens(text, remove_stopwords=False))
             
-            skills = {
+            matches = {
                 'hard_skills': [],
                 'soft_skills': [],
                 'action_verbs': []
             }
             
-            # Extract hard skills
-            for category, skill_list in self.hard_skills.items():
-                for skill in skill_list:
-                    if skill in words:
-                        skills['hard_skills'].append(skill)
-            
-            # Extract soft skills
-            for skill in self.soft_skills:
-                if skill in words:
-                    skills['soft_skills'].append(skill)
+            # One intersection against the skill index instead of scanning every skill list
+            skill_index = self._skill_index
+            for word in skill_index.keys() & words:
+                for group, position in skill_index[word]:
+                    matches[group].append((position, word))
             
-            # Extract action verbs
-            for verb in self.action_verbs:
-                if verb in words:
-                    skills['action_verbs'].append(verb)
-            
-            return skills
+            # Report skills in their list order, as before
+            return {
+                group: [word for _, word in sorted(found)]
+                for group, found in matches.items()
+            }
             
         except Exception as e:
             logger.error(f"Skill extraction failed: {str(e)}")
@@ -25,10 +25,15 @@ Environment:
     - REDIS_URL (for caching)
 """
 import argparse
+import importlib.util
 import sys
 import uvicorn
 from app.config.settings import settings
 
+# Use the faster uvloop event loop and httptools parser when installed
+UVICORN_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+UVICORN_HTTP = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(
@@ -65,8 +70,8 @@ Examples:
     parser.add_argument(
         "--workers",
         type=int,
-        default=1,
-        help="Number of worker processes (production only)"
+        default=settings.WORKERS,
+        help=f"Number of worker processes (production only, default: {settings.WORKERS})"
     )
     
     parser.add_argument(
@@ -88,6 +93,7 @@ def main():
     print(f"📍 Host: {args.host}:{args.port}")
     print(f"🔧 Mode: {'Development' if args.dev else 'Production'}")
     print(f"📊 Log Level: {args.log_level.upper()}")
+    print(f"⚡ Event Loop: {UVICORN_LOOP} / HTTP: {UVICORN_HTTP}")
     
     if args.dev:
         print("🔄 Auto-reload: Enabled")
@@ -104,6 +110,8 @@ def main():
         "host": args.host,
         "port": args.port,
         "log_level": args.log_level,
+        "loop": UVICORN_LOOP,
+        "http": UVICORN_HTTP,
         "access_log": True,
         "server_header": False,  # Don't expose server info
         "date_header": False,    # Don't expose date header
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Optional Cython Build for Hot Schema Modules
+============================================
+Compiles the company research Pydantic schemas to a C extension to cut
+per-request model construction overhead. The pure Python module stays the
+source of truth; when the compiled extension is present next to it Python
+imports the extension instead.
+
+Usage:
+    pip install "cython~=3.0" setuptools
+    python3 setup.py build_ext --inplace
+"""
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+    CYTHON_AVAILABLE = True
+except ImportError:
+    CYTHON_AVAILABLE = False
+
+CYTHON_MODULES = [
+    "app/models/schemas/company_research.py",
+]
+
+if CYTHON_AVAILABLE:
+    ext_modules = cythonize(
+        CYTHON_MODULES,
+        language_level=3,
+        compiler_directives={
+            # Keep Python semantics so Pydantic can introspect fields and validators
+            "binding": True,
+            "annotation_typing": False,
+        },
+    )
+else:
+    # Without Cython the pure Python schemas are used as-is
+    print("Cython not installed; skipping compiled schema extensions")
+    ext_modules = []
+
+setup(
+    name="jobhelp-backend-extensions",
+    ext_modules=ext_modules,
+    zip_safe=False,
+)
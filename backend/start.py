@@ -2,6 +2,7 @@
 """
 Simple production startup script for JobHelp AI API
 """
+import importlib.util
 import uvicorn
 
 if __name__ == "__main__":
@@ -9,6 +10,8 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
         reload=False,
         log_level="info",
         access_log=True
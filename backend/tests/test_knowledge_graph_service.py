@@ -0,0 +1,71 @@
+"""
+Tests for the Knowledge Graph research source
+Outages (no search answered) must stay distinguishable from "no entity found"
+"""
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from app.core.redis_cache import redis_cache
+from app.services.company_research.research_sources.knowledge_graph_service import KnowledgeGraphService
+
+ACME_ENTITY = {
+    "result": {"@id": "kg:/m/acme", "@type": ["Organization", "Corporation"], "name": "Acme"},
+    "resultScore": 100
+}
+
+class KnowledgeGraphOutageTests(unittest.IsolatedAsyncioTestCase):
+    """research() and research_many() when the API does or doesn't answer"""
+    
+    def setUp(self):
+        # Keep lookups in-process; the shared Redis cache is not under test
+        patcher = patch.object(redis_cache, "connected", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.service = KnowledgeGraphService()
+        self.service.api_key = "test-key"
+    
+    def _answer(self, answers):
+        """Make the API return answers[query] (missing queries behave as unanswered)"""
+        self.service._fetch_entities = AsyncMock(side_effect=lambda query, **kwargs: answers.get(query))
+    
+    async def test_research_raises_when_no_search_is_answered(self):
+        self._answer({})
+        
+        with self.assertRaises(RuntimeError):
+            await self.service.research("Acme", "acme.com")
+    
+    async def test_research_returns_empty_result_when_api_finds_nothing(self):
+        self._answer({"Acme": [], "acme.com": []})
+        
+        result = await self.service.research("Acme", "acme.com")
+        
+        self.assertIsNone(result["entity_id"])
+        self.assertEqual(result["note"], "No entity found in Google Knowledge Graph")
+    
+    async def test_research_parses_best_entity(self):
+        self._answer({"Acme": [ACME_ENTITY]})
+        
+        result = await self.service.research("Acme")
+        
+        self.assertEqual(result["entity_id"], "kg:/m/acme")
+        self.assertEqual(result["name"], "Acme")
+    
+    async def test_research_many_marks_unanswered_companies_as_none(self):
+        self._answer({"Acme": [ACME_ENTITY], "Globex": []})
+        
+        results = await self.service.research_many([("Acme", None), ("Globex", None), ("Initech", None)])
+        
+        self.assertEqual(results[0]["entity_id"], "kg:/m/acme")
+        self.assertIsNone(results[1]["entity_id"])
+        self.assertIsNone(results[2])
+    
+    async def test_research_many_returns_none_for_every_company_during_outage(self):
+        self._answer({})
+        
+        results = await self.service.research_many([("Acme", "acme.com"), ("Globex", None)])
+        
+        self.assertEqual(results, [None, None])
+
+if __name__ == "__main__":
+    unittest.main()